@@ -19,6 +19,6 @@ Notes:
 """
 
 from .board import Board, CellState
-from .cluster import create_clusters, create_clusters_color, Clusters
+from .cluster import create_clusters, create_clusters_color, label_clusters, Clusters
 from .game_utils import *
 from .constants import *
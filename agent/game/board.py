@@ -18,10 +18,23 @@ Notes:
 
 from collections import defaultdict
 from dataclasses import dataclass
+from random import Random
 
 from referee.game import HexPos, Action, SpawnAction, SpreadAction, PlayerColor, \
     MAX_CELL_POWER, BOARD_N, MAX_TURNS, MAX_TOTAL_POWER, WIN_POWER_DIFF
 from .constants import *
+from .game_utils import BOARD_POSITIONS
+
+# Zobrist hashing keys - one random key for each (cell, color, power) triplet, and one for the turn;
+# keys are kept under 61 bits so that Python's hash() of the board leaves its value untouched
+ZOBRIST_SEED : int = 30024
+ZOBRIST_BITS : int = 60
+_zobrist_random    = Random(ZOBRIST_SEED)
+ZOBRIST_KEYS : dict[PlayerColor, list[int]] = {
+    color: [_zobrist_random.getrandbits(ZOBRIST_BITS) for _ in range(BOARD_N * BOARD_N * MAX_CELL_POWER)]
+    for color in PlayerColor
+}
+ZOBRIST_TURN : int = _zobrist_random.getrandbits(ZOBRIST_BITS)
 
 
 @dataclass(frozen=True, slots=True)
@@ -87,6 +100,13 @@ class Board:
 
     Attributes:
         _state      : the board's state
+        _colors     : the color of each cell, in flattened board order
+        _powers     : the power of each cell, in flattened board order
+        _hash       : the Zobrist hash of the board, kept up to date with every mutation
+        _bitboards  : the bitboard of each player's cells, where bit i is set if the player occupies
+                      the cell of flattened index i
+        _numbers    : the number of each player's pieces
+        _color_pows : the total power of each player's pieces
         _turn_color : the color for the turn, applicable to play-testing
         _true_turn  : the true turn, not applicable to play-testing
         _turn_count : the number of plays already made to the board, applicable to play-testing
@@ -94,6 +114,12 @@ class Board:
     __slots__ = [
         "_mutable",
         "_state",
+        "_colors",
+        "_powers",
+        "_hash",
+        "_bitboards",
+        "_numbers",
+        "_color_pows",
         "_turn_color",
         "_true_turn",
         "_non_concrete_history",
@@ -125,6 +151,20 @@ class Board:
 
         # other properties initialized
         self._state.update(initial_state)
+
+        # flattened colors and powers of the cells, kept in sync with the state
+        self._colors: list[PlayerColor | None] = [self._state[pos].color for pos in BOARD_POSITIONS]
+        self._powers: list[int] = [self._state[pos].power for pos in BOARD_POSITIONS]
+        self._hash  : int = 0
+        self._bitboards : list[int] = [0, 0]
+        self._numbers   : list[int] = [0, 0]
+        self._color_pows: list[int] = [0, 0]
+        for index, color in enumerate(self._colors):
+            if color is not None:
+                self._hash ^= ZOBRIST_KEYS[color][index * MAX_CELL_POWER + self._powers[index] - 1]
+                self._bitboards[color]  |= 1 << index
+                self._numbers[color]    += 1
+                self._color_pows[color] += self._powers[index]
         self._turn_count: int = 0
         self._turn_color: PlayerColor = PlayerColor.RED
         self._true_turn : PlayerColor = PlayerColor.RED
@@ -147,6 +187,24 @@ class Board:
             cell : the state of the cell
         """
         self._state[pos] = cell
+        index = pos.r * BOARD_N + pos.q
+
+        # hash out the previous cell, and hash in the new one, likewise for the bitboards and counts
+        color = self._colors[index]
+        if color is not None:
+            power = self._powers[index]
+            self._hash ^= ZOBRIST_KEYS[color][index * MAX_CELL_POWER + power - 1]
+            self._bitboards[color]  ^= 1 << index
+            self._numbers[color]    -= 1
+            self._color_pows[color] -= power
+        color = cell.color
+        if color is not None:
+            self._hash ^= ZOBRIST_KEYS[color][index * MAX_CELL_POWER + cell.power - 1]
+            self._bitboards[color]  |= 1 << index
+            self._numbers[color]    += 1
+            self._color_pows[color] += cell.power
+        self._colors[index] = color
+        self._powers[index] = cell.power
 
     def __contains__(self, pos: HexPos) -> bool:
         """
@@ -158,9 +216,10 @@ class Board:
 
     def __hash__(self) -> int:
         """
-        State hashed value.
+        State hashed value, which is the Zobrist hash of the cells and the turn's color. It is
+        maintained incrementally, so this is in constant time.
         """
-        return hash(frozenset(self.get_cells()))
+        return self._hash
 
     def get_cells(self):
         """
@@ -168,6 +227,32 @@ class Board:
         """
         return self._state.values()
 
+    @property
+    def colors(self) -> list[PlayerColor | None]:
+        """
+        The color of each cell in flattened board order, ``None`` if the cell is empty.
+        """
+        return self._colors
+
+    @property
+    def powers(self) -> list[int]:
+        """
+        The power of each cell in flattened board order.
+        """
+        return self._powers
+
+    def bitboard(self, color: PlayerColor) -> int:
+        """
+        The bitboard of a specified player's cells, where bit i is set if the player occupies the
+        cell of flattened index i.
+
+        Args:
+            color: the player's color
+        Returns:
+            the player's bitboard
+        """
+        return self._bitboards[color]
+
     def non_concrete_history_empty(self) -> bool:
         """
         Assertion method - making sure that the non-concrete history is empty.
@@ -226,7 +311,7 @@ class Board:
         """
         The total power of all cells on the board.
         """
-        return sum(map(lambda cell: cell.power, self.get_cells()))
+        return self._color_pows[0] + self._color_pows[1]
 
     def player_cells(self, color: PlayerColor) -> list[CellState]:
         """
@@ -251,7 +336,7 @@ class Board:
         Returns:
             number of player pieces
         """
-        return len(self.player_cells(color))
+        return self._numbers[color]
 
     def color_power(self, color: PlayerColor) -> int:
         """
@@ -262,7 +347,7 @@ class Board:
         Returns:
             their power
         """
-        return sum(map(lambda cell: cell.power, self.player_cells(color)))
+        return self._color_pows[color]
 
     def color_number_and_power(self, color: PlayerColor) -> (int, int):
         """
@@ -274,8 +359,7 @@ class Board:
             * player's number of pieces on board
             * player's total power
         """
-        color_cells = list(map(lambda cell: cell.power, self.player_cells(color)))
-        return len(color_cells), sum(color_cells)
+        return self._numbers[color], self._color_pows[color]
 
     def pos_occupied(self, pos: HexPos) -> bool:
         """
@@ -340,7 +424,7 @@ class Board:
 
         # Compute destination cell coordinates.
         to_cells = [
-            from_cell + dir * (i + 1) for i in range(self[from_cell].power)
+            from_cell.neighbour(dir, i + 1) for i in range(self[from_cell].power)
         ]
 
         # minimal, efficient board mutation
@@ -379,13 +463,25 @@ class Board:
             self[mutation.pos] = mutation.next
 
         # only add to history in the case where it is going down the search tree
-        self._turn_color = self.turn_color.opponent
+        self._turn_color = OPPONENT[self._turn_color]
         self._turn_count += 1
+        self._hash ^= ZOBRIST_TURN
         if not concrete:
             self._non_concrete_history.append(board_mutation)
         else:
             self._true_turn = self._turn_color
 
+    def pass_turn(self):
+        """
+        Pass the turn to the opponent without making any action, used for play-testing only (such
+        as null-move pruning). It is recorded as a non-concrete action without any cell mutation,
+        so it is also undone by ``undo_action``.
+        """
+        self._turn_color = OPPONENT[self._turn_color]
+        self._turn_count += 1
+        self._hash ^= ZOBRIST_TURN
+        self._non_concrete_history.append(BoardMutation(None, set()))
+
     def undo_action(self):
         """
         Undo the last action played, mutating the board state. This is a method specifically
@@ -397,5 +493,6 @@ class Board:
         board_mutation: BoardMutation = self._non_concrete_history.pop()
         for mutation in board_mutation.cell_mutations:
             self[mutation.pos] = mutation.prev
-        self._turn_color = self.turn_color.opponent
+        self._turn_color = OPPONENT[self._turn_color]
         self._turn_count -= 1
+        self._hash ^= ZOBRIST_TURN
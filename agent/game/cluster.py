@@ -20,7 +20,10 @@ from dataclasses import dataclass
 
 from referee.game import HexPos, PlayerColor
 from .board import Board, CellState
-from .game_utils import adjacent_positions
+from .game_utils import adjacent_positions, BOARD_POSITIONS, NEIGHBOUR_INDICES
+
+# the key of each cell within a cluster (its hashed position), in flattened board order
+CELL_KEYS: list[int] = [pos.__hash__() for pos in BOARD_POSITIONS]
 
 
 @dataclass(slots=True)
@@ -331,3 +334,43 @@ def create_clusters_color(board: Board, color: PlayerColor) -> Clusters:
             del clusters
             clusters = clusters_copy
     return clusters
+
+
+def label_clusters(colors: list[PlayerColor | None]) -> (list[int], list[tuple[PlayerColor, int, int, int]]):
+    """
+    Label the clusters of both players directly from the flattened cell colors of the board. This
+    avoids creating any ``Cluster`` object when only the size of clusters and their adjacency are
+    needed. The clusters are the same as those from ``create_clusters``, where each cluster ends up
+    being represented by the last of its cells in board order.
+
+    Args:
+        colors: the color of each cell, in flattened board order
+
+    Returns:
+        * the cluster label of each cell, or -1 if the cell is empty
+        * for each label, the cluster's color, its number of cells, its power (the sum of its cell
+          keys, as with ``Cluster.get_power``) and the index of its last cell
+    """
+    labels  : list[int] = [-1] * len(colors)
+    clusters: list[tuple[PlayerColor, int, int, int]] = []
+
+    # flood fill from each cell that has yet to be labelled
+    for index, color in enumerate(colors):
+        if color is None or labels[index] >= 0:
+            continue
+        label = len(clusters)
+        labels[index] = label
+        stack = [index]
+        size, power, last = 0, 0, index
+        while stack:
+            curr = stack.pop()
+            size  += 1
+            power += CELL_KEYS[curr]
+            if curr > last:
+                last = curr
+            for adj in NEIGHBOUR_INDICES[curr]:
+                if labels[adj] < 0 and colors[adj] == color:
+                    labels[adj] = label
+                    stack.append(adj)
+        clusters.append((color, size, power, last))
+    return labels, clusters
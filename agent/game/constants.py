@@ -11,8 +11,17 @@ Purpose:
 Notes:
 """
 
-INF             : float = float("inf")
+from math import inf
+from referee.game import PlayerColor
+
+INF             : float = inf
 EMPTY_POWER     : int = 0
 MIN_MOVE_WIN    : int = 2
 MIN_TURN_COUNT  : int = 2
 MIN_TOTAL_POWER : int = 12
+
+# the opponent of each player, looked up without going through the enum property
+OPPONENT: dict[PlayerColor, PlayerColor] = {
+    PlayerColor.RED  : PlayerColor.BLUE,
+    PlayerColor.BLUE : PlayerColor.RED
+}
@@ -13,7 +13,25 @@ Purpose:
 Notes:
 """
 
-from referee.game import HexPos, HexDir, SpawnAction, SpreadAction
+from referee.game import HexPos, HexDir, SpawnAction, SpreadAction, BOARD_N
+
+# every direction, every position of the board in flattened (row-major) order, and the flattened
+# indices of each position's adjacent positions
+HEX_DIRECTIONS    : tuple[HexDir, ...]    = tuple(HexDir)
+NUM_DIRECTIONS    : int                   = len(HEX_DIRECTIONS)
+BOARD_POSITIONS   : list[HexPos]          = [HexPos.from_index(index) for index in range(BOARD_N * BOARD_N)]
+NEIGHBOUR_INDICES : list[tuple[int, ...]] = [
+    tuple(((pos.r + dir.r) % BOARD_N) * BOARD_N + (pos.q + dir.q) % BOARD_N for dir in HEX_DIRECTIONS)
+    for pos in BOARD_POSITIONS
+]
+# the adjacent positions of each position, in the order of HexDir
+ADJACENT_POSITIONS: list[tuple[HexPos, ...]] = [
+    tuple(BOARD_POSITIONS[adj] for adj in adjacent) for adjacent in NEIGHBOUR_INDICES
+]
+# the bitboard mask of each position's adjacent positions
+NEIGHBOUR_MASKS   : list[int]             = [
+    sum(1 << adj for adj in set(adjacent)) for adjacent in NEIGHBOUR_INDICES
+]
 
 
 def assert_action(action):
@@ -33,13 +51,25 @@ def assert_action(action):
             raise "Action not matched with any pattern"
 
 
-def adjacent_positions(pos: HexPos) -> list[HexPos]:
+def adjacent_positions(pos: HexPos) -> tuple[HexPos, ...]:
+    """
+    Get all adjacent positions to the specified one, looked up from the precomputed table.
+
+    Args:
+        pos: the specified position
+    Returns:
+        tuple of 6 of its adjacent positions
+    """
+    return ADJACENT_POSITIONS[pos.r * BOARD_N + pos.q]
+
+
+def pos_index(pos: HexPos) -> int:
     """
-    Get all adjacent positions to the specified one.
+    Get the index of a position within the flattened (row-major) board.
 
     Args:
         pos: the specified position
     Returns:
-        list of 6 of its adjacent positions
+        the flattened index of the position
     """
-    return [pos + dir for dir in HexDir]
+    return pos.r * BOARD_N + pos.q
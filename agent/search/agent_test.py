@@ -17,15 +17,18 @@ Notes:
     which uses 3 different play-out approaches.
 """
 
-from random import randint
-from referee.game import Action, PlayerColor, SpawnAction, SpreadAction, HexPos
-from ..game import Board
+from random import randint, randrange
+from referee.game import Action, PlayerColor, SpawnAction, SpreadAction, HexPos, \
+    MAX_TOTAL_POWER
+from ..game import Board, HEX_DIRECTIONS, NUM_DIRECTIONS
 from .search_utils import get_legal_moves
 
 
 def random_move(board: Board, color: PlayerColor) -> Action:
     """
     Agent's move approach where it picks any random move from all of its possible move set.
+    Rather than materializing the whole list of legal moves, it counts them in a single pass,
+    samples an index, and only builds the action at that index.
 
     Args:
         board: the current state of the board
@@ -34,9 +37,24 @@ def random_move(board: Board, color: PlayerColor) -> Action:
     Returns:
         the random action to be taken by agent
     """
-    actions = get_legal_moves(board, color)
-    random_index: int = randint(0, len(actions)-1)
-    return actions[random_index]
+    empty_cells = []
+    color_cells = []
+    total_power = 0
+    for cell in board.get_cells():
+        if cell.color is None:
+            empty_cells.append(cell.pos)
+        else:
+            total_power += cell.power
+            if cell.color == color:
+                color_cells.append(cell.pos)
+
+    # spawn actions come first, followed by every direction of spread for each player cell
+    num_spawns = len(empty_cells) if total_power < MAX_TOTAL_POWER else 0
+    random_index: int = randrange(num_spawns + len(color_cells) * NUM_DIRECTIONS)
+    if random_index < num_spawns:
+        return SpawnAction(empty_cells[random_index])
+    pos_index, dir_index = divmod(random_index - num_spawns, NUM_DIRECTIONS)
+    return SpreadAction(color_cells[pos_index], HEX_DIRECTIONS[dir_index])
 
 
 def greedy_move(board: Board, color: PlayerColor) -> Action:
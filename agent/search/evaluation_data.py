@@ -33,7 +33,7 @@ Notes:
 from dataclasses import dataclass
 
 from referee.game import PlayerColor
-from ..game import Board, INF, create_clusters
+from ..game import Board, INF, label_clusters, NEIGHBOUR_INDICES
 
 # weighting factors
 NUM_PIECE_FACTOR     : float = 2.0
@@ -88,8 +88,9 @@ def get_evaluate_data(board: Board) -> EvaluateData:
     Returns:
         the object containing all data relevant to evaluating a board's state
     """
-    # number of pieces and total power evaluation data
-    data = EvaluateData()
+    # number of pieces and total power evaluation data, kept up to date by the board
+    data     = EvaluateData()
+    colors   = board.colors
     num_red , pow_red  = board.color_number_and_power(PlayerColor.RED)
     num_blue, pow_blue = board.color_number_and_power(PlayerColor.BLUE)
     data.num_red       = num_red
@@ -107,27 +108,30 @@ def get_evaluate_data(board: Board) -> EvaluateData:
         data.immediate = True
         return data
 
-    # clusters and dominance evaluation data
-    clusters = create_clusters(board, PlayerColor.RED)
-    for cluster in clusters:
+    # clusters and dominance evaluation data, computed from the flattened board
+    labels, clusters = label_clusters(colors)
+    for color, size, power, last in clusters:
 
         # red's cluster
-        if cluster.color == PlayerColor.RED:
+        if color == PlayerColor.RED:
             data.num_red_clusters  += 1
-            # dominance factor is checked solely via red pieces
-            for adj_opponent in cluster.get_opponents():
-                blue_cluster = clusters[adj_opponent]
+            # dominance factor is checked solely via red pieces, against the blue clusters that
+            # are adjacent to the cluster's last cell
+            adj_opponents = {labels[adj] for adj in NEIGHBOUR_INDICES[last]
+                             if colors[adj] == PlayerColor.BLUE}
+            for adj_opponent in adj_opponents:
+                _, blue_size, blue_power, _ = clusters[adj_opponent]
 
                 # cluster size dominance
-                if len(cluster) < len(blue_cluster):
+                if size < blue_size:
                     data.num_blue_dominates += 1
-                elif len(cluster) > len(blue_cluster):
+                elif size > blue_size:
                     data.num_red_dominates += 1
 
                 # cluster power dominance
-                if cluster.get_power() < blue_cluster.get_power():
+                if power < blue_power:
                     data.pow_blue_dominates += 1
-                elif cluster.get_power() > blue_cluster.get_power():
+                elif power > blue_power:
                     data.pow_red_dominates += 1
 
         # blue's cluster
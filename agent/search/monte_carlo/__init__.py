@@ -9,8 +9,9 @@ Purpose:
     Provide the Monte Carlo Tree search algorithm function to find the next move for agent.
 
 Notes:
-    Move ordering, which is an alpha-beta pruning optimization method, is also included to be shared
-    with Monte Carlo Tree search algorithm.
+    Children are keyed in the priority queue by their own evaluation, so their expansion order does
+    not matter. Move ordering is only used to cheaply narrow down the candidates when there are too
+    many of them, before the best ``CHILD_LIMIT`` children by evaluation are expanded.
 """
 
 from .monte_carlo import monte_carlo
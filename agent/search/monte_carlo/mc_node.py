@@ -11,7 +11,6 @@ Purpose:
 Notes:
 """
 
-import copy
 import time
 from math import sqrt, log
 
@@ -27,6 +26,10 @@ CHILD_LIMIT      : int   = 20
 SIMULATION_LIMIT : int   = 1000
 UCT_CONSTANT     : float = sqrt(2)
 TIME_LIMIT       : float = 3
+LOG_TABLE_SIZE   : int   = 1 << 12
+
+# precomputed natural logarithms of visit counts, where entry i holds log(i + 1)
+_LOG_TABLE: list[float] = [log(n) for n in range(1, LOG_TABLE_SIZE + 1)]
 
 
 class MonteCarloNode:
@@ -105,50 +108,51 @@ class MonteCarloNode:
         """
         self.sim_score = mc_evaluate(board)
 
-    def calculate_uct(self):
+    def calculate_uct(self, _sqrt=sqrt, _log=log, _c=UCT_CONSTANT, _table=_LOG_TABLE, _size=LOG_TABLE_SIZE):
         """
         Formula for UCT Calculation, tries to find a balance between exploitation and exploration.
+        Module-level names are bound as default arguments for faster local lookups.
         """
-        try:
-            self.uct = self.sim_score + \
-                       UCT_CONSTANT*sqrt(log(self.visited)/self.parent.visited)
-        # Cases where there is division or log of 0
-        except ValueError:
+        visited, parent_visited = self.visited, self.parent.visited
+        # Cases where there would be division or log of 0
+        if visited <= 0 or parent_visited <= 0:
             self.uct = self.sim_score
+            return
+        log_visited = _table[visited - 1] if visited <= _size else _log(visited)
+        self.uct = self.sim_score + _c*_sqrt(log_visited/parent_visited)
 
-    def calculate_new_uct(self):
+    def calculate_new_uct(self, _sqrt=sqrt, _log=log, _c=UCT_CONSTANT, _table=_LOG_TABLE,
+                          _size=LOG_TABLE_SIZE):
         """
         Modify UCT value of node.
         """
         # mcts evaluation value is already normalized
-        self.uct = self.evaluation + \
-            UCT_CONSTANT*sqrt((log(self.visited)/log(self.parent.visited)))
+        visited, parent_visited = self.visited, self.parent.visited
+        if visited <= 0 or parent_visited <= 1:
+            self.uct = self.evaluation
+            return
+        log_visited = _table[visited - 1] if visited <= _size else _log(visited)
+        log_parent  = _table[parent_visited - 1] if parent_visited <= _size else _log(parent_visited)
+        self.uct = self.evaluation + _c*_sqrt(log_visited/log_parent)
 
-    def back_propagate(self, board: Board):
+    def back_propagate(self):
         """
         Each node should have a back propagation function that updates the value of each parent.
-
-        Args:
-            board: the state of board at the node
+        The board is left untouched, since it is moved between nodes by the search itself.
         """
         curr_node: MonteCarloNode = self
         added_value: int = self.victory
         while curr_node is not None:
-            # undo action after applied
-            board.undo_action()
             curr_node.value += added_value
             # Need to update the UCTs of the children
             for child in curr_node.children:
                 child.calculate_uct()
             curr_node = curr_node.parent
 
-    def quick_back_propagate(self, board: Board):
+    def quick_back_propagate(self):
         curr_node: MonteCarloNode = self
         added_value: int = self.victory
         while curr_node is not None:
-            # Since we're only referring to one board,
-            # need to undo the action of the board each time
-            board.undo_action()
             curr_node.value += added_value
             curr_node.visited += 1
             # Need to update the UCTs of the children
@@ -156,21 +160,29 @@ class MonteCarloNode:
                 child.calculate_new_uct()
             curr_node = curr_node.parent
 
-    def light_simulate(self, board: Board):
+    def light_simulate(self, board: Board, start: float, limit=TIME_LIMIT):
         """
         Light simulation - randomly pick moves until a goal state is reached
         Args:
             board: the state of the board at the node
+            start: start time
+            limit: resource limit (in this case is time)
         """
-        test_board: Board = copy.deepcopy(board)
-        while not test_board.game_over:
-            new_action = random_move(test_board, test_board.turn_color)
-            test_board.apply_action(new_action)
-        # Now you have to check which player won
-        if test_board.player_wins(PlayerColor.RED):
+        num_moves: int = 0
+        end = time.time()
+        while end - start < limit and not board.game_over:
+            new_action: Action = random_move(board, board.turn_color)
+            board.apply_action(new_action, concrete=False)
+            num_moves += 1
+            end = time.time()
+
+        # Now you have to check which player won, then revert the board back
+        if board.player_wins(PlayerColor.RED):
             self.victory = RED_VICTORY
-        elif test_board.player_wins(PlayerColor.BLUE):
+        elif board.player_wins(PlayerColor.BLUE):
             self.victory = BLUE_VICTORY
+        for i in range(num_moves):
+            board.undo_action()
 
     def hard_simulate(self, board: Board, start: float, limit=TIME_LIMIT, debug=False):
         """
@@ -232,3 +244,7 @@ class MonteCarloNode:
 
     def __eq__(self, other):
         return self.evaluation == other.evaluation
+
+    # Defining __eq__ drops the inherited hash, so hash by the precomputed board hash instead
+    def __hash__(self):
+        return self.hash_val
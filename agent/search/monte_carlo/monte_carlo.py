@@ -11,19 +11,23 @@ Purpose:
 Notes:
 """
 
+import heapq
 import time
 
 from referee.game import Action
 from ...game import Board
 from ...search import get_legal_moves
 from ..negamax import move_ordering
+from .evaluation import mc_evaluate
 from .mutable_heapq import MutableHeap
-from .mc_node import MonteCarloNode, TIME_LIMIT
+from .mc_node import MonteCarloNode, TIME_LIMIT, CHILD_LIMIT
 
 
 def monte_carlo(board: Board, limit=TIME_LIMIT) -> Action:
     """
-    Monte Carlo Tree search algorithm returning the next action to be taken by agent.
+    Monte Carlo Tree search algorithm returning the next action to be taken by agent. The board
+    always reflects the state of the most recently selected node, and is moved to the next
+    selected node through their closest common ancestor rather than through the root.
 
     Args:
         board      : the board
@@ -37,6 +41,7 @@ def monte_carlo(board: Board, limit=TIME_LIMIT) -> Action:
     open_min     = MutableHeap()
     discovered   = {}
     initial_node = MonteCarloNode(None, board)
+    board_node   = initial_node
     discovered[initial_node.hash_val] = 1
     open_min.add_task(initial_node)
     st = time.time()
@@ -47,46 +52,82 @@ def monte_carlo(board: Board, limit=TIME_LIMIT) -> Action:
         curr_state = open_min.pop_task()
         del discovered[curr_state.hash_val]
 
+        # First get the board to the current state
+        move_board(board, board_node, curr_state)
+        board_node = curr_state
+
         # No need to explore the node if game is already over
         if board.game_over:
             continue
-        num_moves = 0
-        all_moves = []
 
-        # First get the board to the current state
-        backtrack_start = curr_state
-        while backtrack_start.parent is not None:
-            all_moves.append(backtrack_start.action)
-            backtrack_start = backtrack_start.parent
-            num_moves += 1
-        for i in range(num_moves-1, -1, -1):
-            board.apply_action(all_moves[i], concrete=False)
-
-        # Then get all the neighbors associated with the current node
-        legal_moves   = get_legal_moves(board, board.turn_color)
-        ordered_moves = move_ordering(board, board.turn_color, legal_moves)
-        for neighbor in ordered_moves:
-            curr_neighbor: MonteCarloNode = MonteCarloNode(neighbor, board, curr_state)
+        # Then get all the neighbors associated with the current node - their order does not
+        # matter since every one of them is pushed to the heap keyed by its own evaluation;
+        # when there are too many, only the most promising by move ordering are considered
+        legal_moves = get_legal_moves(board, board.turn_color)
+        if len(legal_moves) > 2 * CHILD_LIMIT:
+            legal_moves = move_ordering(board, board.turn_color, legal_moves)[:2 * CHILD_LIMIT]
+
+        # evaluate every neighbor that has not yet been discovered
+        candidates: dict[int, tuple[float, Action]] = {}
+        for neighbor in legal_moves:
+            board.apply_action(neighbor, concrete=False)
+            hash_val = board.__hash__()
+            if hash_val not in discovered:
+                candidates[hash_val] = (mc_evaluate(board), neighbor)
+            board.undo_action()
 
-            # Only add to the node if the board has not yet been discovered
-            if curr_neighbor.hash_val not in discovered:
-                curr_neighbor.evaluate_node(board)
-                new_evaluation = curr_neighbor.evaluation
-                open_min.add_task(curr_neighbor, new_evaluation)
-                discovered[curr_neighbor.hash_val] = 1
+        # only expand the best children for the player to move (evaluation is of the true turn)
+        select = heapq.nlargest if board.turn_color == board.true_turn else heapq.nsmallest
+        for new_evaluation, neighbor in select(CHILD_LIMIT, candidates.values(), key=lambda x: x[0]):
+            board.apply_action(neighbor, concrete=False)
+            curr_neighbor: MonteCarloNode = MonteCarloNode(neighbor, board, curr_state)
+            curr_neighbor.evaluation = new_evaluation
+            open_min.add_task(curr_neighbor, new_evaluation)
+            discovered[curr_neighbor.hash_val] = 1
             board.undo_action()
 
         # simulations and backpropagation (only when this isn't the first node)
         if operation > 0:
             curr_state.hard_simulate(board, st, limit)
-            curr_state.back_propagate(board)
-
-        # Undo the actions for the board
-        for i in range(num_moves):
-            board.undo_action()
+            curr_state.back_propagate()
         operation += 1
         et = time.time()
 
+    # revert the board back to the initial node
+    move_board(board, board_node, initial_node)
+
     # go back to the initial node and get the child node with the highest UCT
     picked_action = sorted(initial_node.children, key=lambda x: x.uct, reverse=True)[0].action
     return picked_action
+
+
+def move_board(board: Board, source: MonteCarloNode, target: MonteCarloNode):
+    """
+    Move the board from the state of one node to the state of another node of the same tree. Only
+    the actions between either node and their closest common ancestor are undone or applied.
+
+    Args:
+        board  : the board, currently at the state of the source node
+        source : the node that the board is currently at
+        target : the node that the board will be moved to
+    """
+    forward_actions: list[Action] = []
+
+    # bring both nodes to the same depth
+    while target.depth > source.depth:
+        forward_actions.append(target.action)
+        target = target.parent
+    while source.depth > target.depth:
+        board.undo_action()
+        source = source.parent
+
+    # then walk up together until the common ancestor is reached
+    while source is not target:
+        board.undo_action()
+        source = source.parent
+        forward_actions.append(target.action)
+        target = target.parent
+
+    # apply the actions leading down to the target node
+    for action in reversed(forward_actions):
+        board.apply_action(action, concrete=False)
@@ -12,20 +12,19 @@ Purpose:
 Notes:
     This is a max heap structure which sorts list of nodes with priority being the best UCT score.
     Since these scores are constantly being mutated, a mutable heap structure is therefore needed.
+    The heap only ever holds live entries, so its size is the number of nodes in the queue.
 """
 
-import heapq
 import itertools
 from .mc_node import MonteCarloNode
 
-REMOVED = None
-NEW     = 'new'
-
 
 class MutableHeap:
     """
     Mutable heap object representing a max-heap with values of its entries mutable.
-    The entries of the mutable heap is the node of the Monte Carlo tree.
+    The entries of the mutable heap is the node of the Monte Carlo tree. It is an indexed binary
+    heap, where the position of every entry is tracked, so that an entry can be updated or removed
+    in place without leaving stale entries behind.
     """
 
     def __init__(self):
@@ -38,27 +37,84 @@ class MutableHeap:
         """
         Add a new task or update the priority of an existing task
         """
-        if task.hash_val in self.entry_finder:
-            self.remove_task(task)
         count = next(self.counter)
         entry = [task.depth, priority, count, task]
-        self.entry_finder[task.hash_val] = entry
-        heapq.heappush(self.pq, entry)
+        index = self.entry_finder.get(task.hash_val)
+        if index is None:
+            index = len(self.pq)
+            self.pq.append(entry)
+        else:
+            self.pq[index] = entry
+        self.entry_finder[task.hash_val] = index
+        self._sift_down(self._sift_up(index))
 
     def remove_task(self, task: MonteCarloNode):
         """
-        Mark an existing task as REMOVED.  Raise KeyError if not found.
+        Remove an existing task.  Raise KeyError if not found.
         """
-        entry = self.entry_finder.pop(task.hash_val)
-        entry[-1] = None
+        index = self.entry_finder.pop(task.hash_val)
+        last = self.pq.pop()
+        if index < len(self.pq):
+            self.pq[index] = last
+            self.entry_finder[last[-1].hash_val] = index
+            self._sift_down(self._sift_up(index))
 
     def pop_task(self):
         """
         Remove and return the lowest priority task. Raise KeyError if empty.
         """
-        while self.pq:
-            depth, priority, count, task = heapq.heappop(self.pq)
-            if task is not None:
-                del self.entry_finder[task.hash_val]
-                return task
-        raise KeyError('pop from an empty priority queue')
+        if not self.pq:
+            raise KeyError('pop from an empty priority queue')
+        task = self.pq[0][-1]
+        self.remove_task(task)
+        return task
+
+    def _sift_up(self, index: int) -> int:
+        """
+        Move an entry up towards the root until its parent is not greater than itself.
+        Args:
+            index: the entry's index in the heap
+        Returns:
+            the entry's new index
+        """
+        pq, entry_finder = self.pq, self.entry_finder
+        entry = pq[index]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = pq[parent_index]
+            if not entry < parent:
+                break
+            pq[index] = parent
+            entry_finder[parent[-1].hash_val] = index
+            index = parent_index
+        pq[index] = entry
+        entry_finder[entry[-1].hash_val] = index
+        return index
+
+    def _sift_down(self, index: int) -> int:
+        """
+        Move an entry down towards the leaves until neither of its children is smaller than itself.
+        Args:
+            index: the entry's index in the heap
+        Returns:
+            the entry's new index
+        """
+        pq, entry_finder = self.pq, self.entry_finder
+        size  = len(pq)
+        entry = pq[index]
+        while True:
+            child_index = 2 * index + 1
+            if child_index >= size:
+                break
+            right_index = child_index + 1
+            if right_index < size and pq[right_index] < pq[child_index]:
+                child_index = right_index
+            child = pq[child_index]
+            if not child < entry:
+                break
+            pq[index] = child
+            entry_finder[child[-1].hash_val] = index
+            index = child_index
+        pq[index] = entry
+        entry_finder[entry[-1].hash_val] = index
+        return index
@@ -11,13 +11,21 @@ Purpose:
 Notes:
     The evaluation function for NegaScout and Negamax is a **zero-sum** evaluation function.
     We make RED as the maximizing side, and BLUE as the minimizing side. Used in ``negamax.py``.
+    Evaluated values are cached in the transposition table, keyed by the board's hashed value.
 """
 
 from ...search.evaluation_data import *
+from .transposition import TRANSPOSITION_TABLE
 
 # Constants
 MAXIMIZE_PLAYER: PlayerColor = PlayerColor.RED
 
+# the sign of the evaluation from the perspective of each player
+SIGN: dict[PlayerColor, int] = {
+    MAXIMIZE_PLAYER          :  1,
+    MAXIMIZE_PLAYER.opponent : -1
+}
+
 
 def evaluate(board: Board) -> float:
     """
@@ -34,12 +42,18 @@ def evaluate(board: Board) -> float:
     Returns:
         the evaluated value of the board
     """
+    key    = board.__hash__()
+    cached = TRANSPOSITION_TABLE.probe_static(key)
+    if cached is not None:
+        return cached
     data: EvaluateData = get_evaluate_data(board)
     if data.immediate:
+        TRANSPOSITION_TABLE.store_static(key, data.immediate_eval)
         return data.immediate_eval
     value  = (data.num_red           - data.num_blue          ) * NUM_PIECE_FACTOR
     value += (data.pow_red           - data.pow_blue          ) * POW_PIECE_FACTOR
     value += (data.num_red_clusters  - data.num_blue_clusters ) * NUM_CLUSTER_FACTOR
     value += (data.num_red_dominates - data.num_blue_dominates) * NUM_DOMINANCE_FACTOR
     value += (data.pow_red_dominates - data.pow_blue_dominates) * POW_DOMINANCE_FACTOR
+    TRANSPOSITION_TABLE.store_static(key, value)
     return value
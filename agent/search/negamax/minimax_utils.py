@@ -20,18 +20,68 @@ Notes:
     hence any moves that may not seem desirable can simply be filtered out.
 """
 
-from collections import defaultdict
+from typing import Iterator
 
-from referee.game import HexPos, HexDir, PlayerColor, \
-                         Action, SpawnAction, SpreadAction, \
-                         MAX_TOTAL_POWER, BOARD_N, WIN_POWER_DIFF
-from ...game import Board, adjacent_positions, \
-                    Clusters, create_clusters_color, \
-                    MIN_TOTAL_POWER, EMPTY_POWER
-from ..search_utils import get_legal_moves
+from referee.game import PlayerColor, \
+                         Action, SpreadAction, \
+                         MAX_TOTAL_POWER, MAX_CELL_POWER, BOARD_N, WIN_POWER_DIFF
+from ...game import Board, label_clusters, \
+                    HEX_DIRECTIONS, NUM_DIRECTIONS, BOARD_POSITIONS, NEIGHBOUR_INDICES, NEIGHBOUR_MASKS, \
+                    MIN_TOTAL_POWER, EMPTY_POWER, OPPONENT
+from ..search_utils import get_legal_moves, action_index, SPAWN_ACTIONS, SPREAD_ACTIONS, NUM_ACTIONS
 
 # Constant
 MAX_ENDGAME_NUM_OPPONENT: int = 2
+MAX_PLY                 : int = 32
+
+# killer moves (the two latest quiet actions causing a cutoff) of each ply, and the history scores
+# of quiet actions causing cutoffs of each player, indexed by action index, shared across the search
+KILLER_MOVES  : list[list[Action | None]] = [[None, None] for _ in range(MAX_PLY)]
+HISTORY_TABLE : list[list[int]]           = [[0] * NUM_ACTIONS for _ in PlayerColor]
+
+# for each cell and direction, the flattened indices of the cells that reach the cell when spreading
+# in that direction, by their distance (up to half the board)
+ENDGAME_RAYS: list[tuple[tuple[int, ...], ...]] = [
+    tuple(
+        tuple(((pos.r - dir.r * s) % BOARD_N) * BOARD_N + (pos.q - dir.q * s) % BOARD_N
+              for s in range(1, BOARD_N//2 + 1))
+        for dir in HEX_DIRECTIONS
+    )
+    for pos in BOARD_POSITIONS
+]
+# the bitboard mask of each of these rays
+ENDGAME_RAY_MASKS: list[tuple[int, ...]] = [
+    tuple(sum(1 << curr for curr in set(ray)) for ray in rays) for rays in ENDGAME_RAYS
+]
+
+# for each spread action (by its index), the flattened indices of the cells it reaches, by distance
+SPREAD_RAYS: list[tuple[int, ...]] = [
+    tuple(((pos.r + dir.r * s) % BOARD_N) * BOARD_N + (pos.q + dir.q * s) % BOARD_N
+          for s in range(1, MAX_CELL_POWER + 1))
+    for pos in BOARD_POSITIONS for dir in HEX_DIRECTIONS
+]
+
+# for each cell, the bitboard mask of its adjacent cell in each direction, paired with the spread
+# action of the cell in that direction
+SPREAD_TARGETS: list[tuple[tuple[int, SpreadAction], ...]] = [
+    tuple((1 << adj, SPREAD_ACTIONS[index * NUM_DIRECTIONS + d]) for d, adj in enumerate(adjacent))
+    for index, adjacent in enumerate(NEIGHBOUR_INDICES)
+]
+
+# preallocated list of actions of each ply, reused by every node of that ply
+MOVE_BUFFERS  : list[list[Action]]                    = [[] for _ in range(MAX_PLY)]
+
+# the capture values of the actions scored by move ordering, in the order they were generated, for
+# each board state, player and number of actions (the oldest board state is evicted first)
+ORDER_CACHE_SIZE : int = 1 << 14
+ORDER_CACHE      : dict[tuple[int, PlayerColor, int], list[int]] = {}
+
+# bit fields of the sort key of move ordering, from the least significant: the player's piece power,
+# the history of cutoffs, the reverse number of pieces captured, and the total power captured
+HISTORY_SHIFT    : int = 4
+PIECES_SHIFT     : int = 40
+CAPTURED_SHIFT   : int = 44
+MAX_HISTORY      : int = (1 << (PIECES_SHIFT - HISTORY_SHIFT)) - 1
 
 
 def check_endgame(board: Board, color: PlayerColor) -> list[Action]:
@@ -49,62 +99,70 @@ def check_endgame(board: Board, color: PlayerColor) -> list[Action]:
     # list of actions on the condition that it has reached endgame
     actions: list[Action] = []
     player_num, player_power = board.color_number_and_power(color)
-    opponent_num, opponent_power = board.color_number_and_power(color.opponent)
+    opponent_num, opponent_power = board.color_number_and_power(OPPONENT[color])
 
-    # dictionary for piece and actions, and their capture potential -> greedy
-    action_capture : dict[(HexPos, HexDir), int] = defaultdict()
-    stacked_capture: dict[(HexPos, HexDir), int] = defaultdict()
-    final          : dict[(HexPos, HexDir), int]
+    # dictionary for piece and actions, and their capture potential -> greedy; an action is keyed by
+    # the flattened index of its piece times the number of directions, plus its direction's index, and
+    # the actions capturing a stacked opponent are kept in order as the keys of a dict
+    action_capture : dict[int, int]  = {}
+    stacked_capture: dict[int, None] = {}
+    final          : dict[int, int] | dict[int, None]
 
     # endgame conditions: minimal player power requirement
     if player_power >= MAX_TOTAL_POWER // 4:
-        opponents = board.player_cells(color.opponent)
-        bool_single_power = [opponent.power == 1 for opponent in opponents]
-        single_power = list(map(lambda x: x, bool_single_power))
+        opponent_color = OPPONENT[color]
+        colors = board.colors
+        powers = board.powers
+        num_single_power = sum(1 for cell_color, power in zip(colors, powers)
+                               if cell_color == opponent_color and power == 1)
 
         # endgame: if number of opponents less than a third of player's with mostly single-power
-        endgame = opponent_num <= player_num // 3 and len(single_power) >= len(bool_single_power)-1
+        endgame = opponent_num <= player_num // 3 and num_single_power >= opponent_num - 1
         if not endgame:
             return []
 
         # make sure that all clusters of opponent must be of size 2 or lower
-        opponent_clusters: Clusters = create_clusters_color(board, color.opponent)
-        for cluster in opponent_clusters:
-            if len(cluster) > 2:
+        labels, clusters = label_clusters(colors)
+        player_bb = board.bitboard(color)
+        if any(cluster_color == opponent_color and size > 2 for cluster_color, size, _, _ in clusters):
+            return []
+
+        # the opponent's pieces are visited cluster by cluster in the order of their last cell, and
+        # from that last cell first, as clusters are built by ``create_clusters_color``
+        opponents = [index for index, cell_color in enumerate(colors) if cell_color == opponent_color]
+        opponents.sort(key=lambda index: (clusters[labels[index]][3], index != clusters[labels[index]][3]))
+        for index in opponents:
+            size = clusters[labels[index]][1]
+            # if piece is stacked, then it must be cleared out, otherwise not endgame
+            stacked = powers[index] > 1
+            cleared = not stacked
+
+            # for each direction, get the cells within reach in the same direction, skipping the
+            # directions without any of the player's pieces
+            ray_masks = ENDGAME_RAY_MASKS[index]
+            for d, ray in enumerate(ENDGAME_RAYS[index]):
+                if not ray_masks[d] & player_bb:
+                    continue
+                for s, curr in enumerate(ray, 1):
+                    # make sure that it has to be the player's cell
+                    if colors[curr] != color:
+                        continue
+                    # append to actions if cell can reach the opponent and its power
+                    # at least is equal to the opponent's cluster size
+                    power = powers[curr]
+                    if power >= s and power >= size:
+                        cleared = True
+                        key = curr * NUM_DIRECTIONS + d
+                        action_capture[key] = action_capture.get(key, 0) + 1
+                        if stacked:
+                            stacked_capture[key] = None
+            # if stacked opponent cannot be cleared, then it isn't endgame
+            if not cleared:
                 return []
-            for opponent in cluster:
-                # if piece is stacked, then it must be cleared out, otherwise not endgame
-                stacked = opponent.power > 1
-                cleared = not stacked
-
-                # for each direction, get the same direction ranges
-                for dir in HexDir:
-                    for s in range(1, BOARD_N//2 + 1):
-                        curr_pos = opponent.pos - dir * s
-                        cell = board[curr_pos]
-                        # make sure that it has to be the player's cell
-                        if cell.color != color:
-                            continue
-                        # append to actions if cell can reach the opponent and its power
-                        # at least is equal to the opponent's cluster size
-                        if cell.power >= abs(s) and cell.power >= len(cluster):
-                            cleared = True
-                            key = (curr_pos, dir)
-                            if key in action_capture:
-                                action_capture[key] += 1
-                            else:
-                                action_capture[key] = 1
-                            if stacked:
-                                stacked_capture[key] = 1
-                # if stacked opponent cannot be cleared, then it isn't endgame
-                if not cleared:
-                    return []
-
-        # if there is a stacked opponent, then we update number of captures in captured dict
+
+        # if there is a stacked opponent, then only the actions capturing it are taken
         if stacked_capture:
             final = stacked_capture
-            for key in stacked_capture.keys():
-                stacked_capture[key] += action_capture[key]
         # otherwise, either no stacked opponent or not endgame (no opponent can be captured)
         elif action_capture:
             final = action_capture
@@ -113,39 +171,45 @@ def check_endgame(board: Board, color: PlayerColor) -> list[Action]:
 
         # sort the actions by following priorities
         action_sorted = sorted(
-            final.items(),
-            key = lambda item: (
-                item[1],                # 1. number of captures
-                board[item[0][0]].power # 2. piece power
+            final,
+            key = lambda key: (
+                action_capture[key],            # 1. number of captures
+                powers[key // NUM_DIRECTIONS]   # 2. piece power
             ),
             reverse=True
         )
 
-        for (pos, dir), _ in action_sorted:
-            actions.append(SpreadAction(pos, dir))
+        for key in action_sorted:
+            actions.append(SPREAD_ACTIONS[key])
     return actions
 
 
-def get_optimized_legal_moves(board: Board, color: PlayerColor, full=True) -> (list[Action], bool):
+def get_optimized_legal_moves(board: Board, color: PlayerColor, full=True,
+                              actions: list[Action] = None) -> (list[Action], bool):
     """
     Get optimized legal moves of a specified player color from a specific state of the board.
     Optimizations made are to reduce the number of legal moves had to be generated in Minimax
     tree.
 
     Args:
-        board : specified board
-        color : specified player's color
-        full  : `True` to get the full list of legal moves, or `False` to get the reduced list
-                of all possible legal actions
+        board   : specified board
+        color   : specified player's color
+        full    : `True` to get the full list of legal moves, or `False` to get the reduced list
+                  of all possible legal actions
+        actions : the list to be cleared and filled with the actions, default = None for a new list
 
     Returns:
         * list of all actions that could be applied to board,
         * boolean indicating whether endgame has been reached
     """
     # if the actual player side is being overwhelmed, forcefully get all legal moves possible
-    actions: list[Action] = []
+    if actions is None:
+        actions = []
+    else:
+        actions.clear()
+    opponent       = OPPONENT[color]
     player_power   = board.color_power(color)
-    opponent_power = board.color_power(color.opponent)
+    opponent_power = board.color_power(opponent)
     total_power    = player_power + opponent_power
     if not full:
         if player_power == EMPTY_POWER:
@@ -157,95 +221,256 @@ def get_optimized_legal_moves(board: Board, color: PlayerColor, full=True) -> (l
 
     # endgame check
     if not full:
-        actions = check_endgame(board, color)
+        actions.extend(check_endgame(board, color))
         if len(actions) > 0:
             return actions, True
 
     # getting all legal moves
     if full:
-        return get_legal_moves(board, color), False
-
-    for cell in board.get_cells():
-        pos = cell.pos
+        get_legal_moves(board, color, actions)
+        return actions, False
+
+    # cells are read from the flattened board, with their adjacent cells in the order of HexDir, and
+    # adjacency to a player is tested against their bitboard
+    colors      = board.colors
+    powers      = board.powers
+    player_bb   = board.bitboard(color)
+    opponent_bb = board.bitboard(opponent)
+    occupied_bb = player_bb | opponent_bb
+    can_spawn   = total_power < MAX_TOTAL_POWER
+
+    # condition to allow spread onto itself
+    spread_onto_self = total_power >= MAX_TOTAL_POWER // 2 - 1 and \
+                       abs(player_power - opponent_power) <= WIN_POWER_DIFF
+    for index, cell_color in enumerate(colors):
+        start = index * NUM_DIRECTIONS
         # check for spread cells
-        if cell.color == color:
-            if board[pos].power == 1:
-                # condition to allow spread onto itself
-                if total_power >= MAX_TOTAL_POWER // 2 - 1 and \
-                        abs(player_power - opponent_power) <= WIN_POWER_DIFF:
-                    for dir in HexDir:
-                        adj = pos + dir
-                        if board.pos_occupied(adj):
-                            actions.append(SpreadAction(pos, dir))
+        if cell_color == color:
+            if powers[index] == 1:
+                # spread onto any adjacent piece, or only onto the opponent's pieces
+                if spread_onto_self:
+                    for mask, action in SPREAD_TARGETS[index]:
+                        if occupied_bb & mask:
+                            actions.append(action)
                 # add if spread is a non-quiet action
-                else:
-                    for dir in HexDir:
-                        adj = pos + dir
-                        if board[adj].color == color.opponent:
-                            actions.append(SpreadAction(pos, dir))
+                elif NEIGHBOUR_MASKS[index] & opponent_bb:
+                    for mask, action in SPREAD_TARGETS[index]:
+                        if opponent_bb & mask:
+                            actions.append(action)
             # otherwise, full list requested, or position has power exceeding 1
             else:
-                actions.extend([SpreadAction(pos, dir) for dir in HexDir])
+                actions.extend(SPREAD_ACTIONS[start:start + NUM_DIRECTIONS])
 
         # check for every spawn cells
-        elif not board.pos_occupied(pos) and board.total_power() < MAX_TOTAL_POWER:
+        elif can_spawn and powers[index] == EMPTY_POWER:
             # spawn is skipped if the spawn is not adjacent to any of player's cell
-            adj_list = adjacent_positions(pos)
-            if any([board[adj].color == color for adj in adj_list]):
-                actions.append(SpawnAction(pos))
+            if NEIGHBOUR_MASKS[index] & player_bb:
+                actions.append(SPAWN_ACTIONS[index])
     return actions, False
 
 
-def move_ordering(board: Board, color: PlayerColor, actions: list[Action]) -> list[Action]:
+def is_capture(board: Board, color: PlayerColor, action: Action) -> bool:
+    """
+    Check whether an action captures any opponent piece. Only spread actions can capture, when an
+    opponent piece is within their reach.
+
+    Args:
+        board  : the board, before the action is applied
+        color  : player's color
+        action : the action
+    Returns:
+        `True` if the action captures, `False` if it is a quiet action
+    """
+    # spawn actions are indexed after every spread action
+    key = action_index(action)
+    if key >= len(SPREAD_ACTIONS):
+        return False
+    colors   = board.colors
+    opponent = OPPONENT[color]
+    for curr in SPREAD_RAYS[key][:board.powers[key // NUM_DIRECTIONS]]:
+        if colors[curr] == opponent:
+            return True
+    return False
+
+
+def get_capture_moves(board: Board, color: PlayerColor) -> list[Action]:
+    """
+    Get all spread actions of a specified player that capture at least one opponent piece. These
+    are the `loud` actions searched by quiescence search. The spread of each cell is followed over
+    the flattened board via the precomputed rays, without any position arithmetic.
+
+    Args:
+        board : specified board
+        color : specified player's color
+
+    Returns:
+        list of all capturing actions
+    """
+    actions: list[Action] = []
+    colors   = board.colors
+    powers   = board.powers
+    opponent = OPPONENT[color]
+    for index, cell_color in enumerate(colors):
+        if cell_color != color:
+            continue
+        power = powers[index]
+        start = index * NUM_DIRECTIONS
+        for key in range(start, start + NUM_DIRECTIONS):
+            for curr in SPREAD_RAYS[key][:power]:
+                if colors[curr] == opponent:
+                    actions.append(SPREAD_ACTIONS[key])
+                    break
+    return actions
+
+
+def update_heuristics(board: Board, color: PlayerColor, action: Action, ply: int, depth: int):
+    """
+    Record a quiet action that caused a cutoff, both as a killer move of its ply and in the history
+    table. Actions that capture are already ordered first by move ordering, so they are skipped.
+
+    Args:
+        board  : the board, before the action is applied
+        color  : player's color
+        action : the action causing the cutoff
+        ply    : the number of actions from the root of the search
+        depth  : the remaining depth of the search
+    """
+    if is_capture(board, color, action):
+        return
+    if ply < MAX_PLY:
+        killers = KILLER_MOVES[ply]
+        if action != killers[0]:
+            killers[1] = killers[0]
+            killers[0] = action
+    HISTORY_TABLE[color][action_index(action)] += depth * depth
+
+
+def clear_heuristics():
+    """
+    Clear the killer moves and the history table, before a new search.
+    """
+    for killers in KILLER_MOVES:
+        killers[0] = killers[1] = None
+    for history in HISTORY_TABLE:
+        history[:] = [0] * NUM_ACTIONS
+
+
+def move_ordering(board: Board, color: PlayerColor, actions: list[Action], tt_action: Action = None,
+                  ply: int = None) -> list[Action]:
     """
     Move ordering for speed-up pruning. Using domain knowledge of the game, this will more likely
-    to choose a better move first in order to prune more branches before expanding them.
+    to choose a better move first in order to prune more branches before expanding them. The best
+    action previously found from the board state, if any, is always placed first, followed by the
+    killer moves of the ply. Ties are broken by the history table. The list of actions is ordered
+    in place. The capture values of the actions are cached for each board state, since the same
+    board state is ordered again by every deeper iteration.
 
     Args:
-        board   : the board
-        color   : player's color to have their legal moves ordered by probabilistic desirability
-        actions : the list of legal actions for player
+        board     : the board
+        color     : player's color to have their legal moves ordered by probabilistic desirability
+        actions   : the list of legal actions for player
+        tt_action : the best action stored in the transposition table, default = None
+        ply       : the number of actions from the root of the search, default = None for no killers
 
     Returns:
-        the ordered list of actions
-    """
-    action_values: list[tuple[Action, int, int, int]] = [(None, # action
-                                                          0,    # total power captured
-                                                          0,    # total number of captured
-                                                          0     # player's piece power
-                                                          )] * len(actions)
-    # for each action of the player's list of legal moves
-    index = 0
-    for action in actions:
-        match action:
-            # spawn means adding their power by 1
-            case SpawnAction(_):
-                action_values[index] = (action, 0, 0, 0)
-            # spread can either be a power-1 spread, or higher, which is possibly more desirable
-            case SpreadAction(pos, dir):
-                power = board[action.cell].power
-                total_blue_power  = 0
-                total_blue_pieces = 0
-                for s in range(1, power + 1):
-                    curr_pos = pos + dir * s
-                    if board[curr_pos].color == color.opponent:
-                        total_blue_power  += board[curr_pos].power
-                        total_blue_pieces += 1
-                # Now add these values into the tuple to sort
-                action_values[index] = (action, total_blue_power, total_blue_pieces, power)
-            # error case
-            case _:
-                raise Exception("move_ordering: Action not of any type")
-        index += 1
-
-    # sort the actions by their desirability, in decreasing order, in following priorities
-    action_values.sort(
-        key=lambda tup: (
-            tup[1],    # 1. total power captured
-            -tup[2],   # 2. reverse number of pieces captured (viz. more stacked captures)
-            tup[3]     # 3. player's piece power
-        ),
-        reverse=True
-    )
+        the ordered list of actions, which is the given list itself
+    """
+    opponent = OPPONENT[color]
+    colors   = board.colors
+    powers   = board.powers
+
+    def static_key(action: Action) -> int:
+        """
+        The part of the sort key of an action which only depends on the board state, packed into a
+        single integer: the total power captured, the reverse number of pieces captured (viz. more
+        stacked captures) and the player's piece power.
+        """
+        # spawn actions are indexed after every spread action, and spawn means adding their power by 1
+        key = action_index(action)
+        if key >= len(SPREAD_ACTIONS):
+            return MAX_CELL_POWER << PIECES_SHIFT
+
+        # spread can either be a power-1 spread, or higher, which is possibly more desirable
+        power = powers[key // NUM_DIRECTIONS]
+        total_blue_power  = 0
+        total_blue_pieces = 0
+        for curr in SPREAD_RAYS[key][:power]:
+            if colors[curr] == opponent:
+                total_blue_power  += powers[curr]
+                total_blue_pieces += 1
+        return (total_blue_power << CAPTURED_SHIFT) | \
+               ((MAX_CELL_POWER - total_blue_pieces) << PIECES_SHIFT) | power
+
+    # the actions of a board state are always generated in the same order, so their static keys are
+    # cached in that order - at worst, a stale entry only worsens the ordering
+    cache_key = (board.__hash__(), color, len(actions))
+    values    = ORDER_CACHE.get(cache_key)
+    if values is None:
+        if len(ORDER_CACHE) >= ORDER_CACHE_SIZE:
+            del ORDER_CACHE[next(iter(ORDER_CACHE))]
+        values = ORDER_CACHE[cache_key] = [static_key(action) for action in actions]
+
+    # sort the actions by their desirability, in decreasing order, in following priorities:
+    #   1. total power captured
+    #   2. reverse number of pieces captured (viz. more stacked captures)
+    #   3. history of cutoffs
+    #   4. player's piece power
+    history = HISTORY_TABLE[color]
+    keys    = [value | (min(history[action_index(action)], MAX_HISTORY) << HISTORY_SHIFT)
+               for value, action in zip(values, actions)]
+    order   = sorted(range(len(actions)), key=keys.__getitem__, reverse=True)
+    actions[:] = [actions[i] for i in order]
+
+    # killer moves of the ply are searched right after the stored best action
+    if ply is not None and ply < MAX_PLY:
+        for killer in reversed(KILLER_MOVES[ply]):
+            if killer is not None and killer != tt_action and killer in actions:
+                actions.remove(killer)
+                actions.insert(0, killer)
+
+    # the stored best action is searched first, as it is the most likely to cause a cutoff
+    if tt_action is not None and tt_action in actions:
+        actions.remove(tt_action)
+        actions.insert(0, tt_action)
+    return actions
+
+
+def lazy_move_ordering(board: Board, color: PlayerColor, actions: list[Action], tt_action: Action = None,
+                       ply: int = None) -> Iterator[Action]:
+    """
+    Lazy move ordering, yielding the actions in the same priorities as ``move_ordering``. The stored
+    best action and the killer moves are yielded first, and the remaining actions are only ordered
+    once they are needed. Since these first actions are the most likely to cause a cutoff, ordering
+    the rest of the actions is often skipped altogether. The board must be in the same state every
+    time the next action is requested.
+
+    Args:
+        board     : the board
+        color     : player's color to have their legal moves ordered by probabilistic desirability
+        actions   : the list of legal actions for player, ordered in place once needed
+        tt_action : the best action stored in the transposition table, default = None
+        ply       : the number of actions from the root of the search, default = None for no killers
+
+    Yields:
+        the actions, in order
+    """
+    # the stored best action, followed by the killer moves of the ply, if they are legal
+    first = [tt_action]
+    if ply is not None and ply < MAX_PLY:
+        first.extend(KILLER_MOVES[ply])
+    yielded: list[Action] = []
+    for candidate in first:
+        if candidate is None or candidate in yielded:
+            continue
+        for action in actions:
+            if action == candidate:
+                yielded.append(action)
+                yield action
+                break
+
+    # the rest of the actions, ordered by their desirability
+    if len(yielded) < len(actions):
+        for action in move_ordering(board, color, actions):
+            if not any(action is prev for prev in yielded):
+                yield action
 
-    return list(map(lambda tup: tup[0], action_values))
@@ -11,22 +11,39 @@ Purpose:
 
 Notes:
     Negamax (and NegaScout) algorithm, to reach further depth requires a variety of different
-    optimization methods introduced in ``minimax_utils.py``.
+    optimization methods introduced in ``minimax_utils.py``. Searched board states are also kept
+    in the transposition table from ``transposition.py``, so that transpositions are not searched
+    again.
 |
 References:
     Reinefeld, A. (1983). `An Improvement to the Scout Tree-Search Algorithm`
     [Journal of the International Computer Games Association] https://doi.org/10.3233/ICG-1983-6402
 """
 
+from multiprocessing import Pool
 from time import time
 from referee.game import PlayerColor, Action
-from ...game import Board, assert_action, INF
-from .evaluation import evaluate, MAXIMIZE_PLAYER
-from .minimax_utils import get_optimized_legal_moves, move_ordering
+from ...game import Board, assert_action, INF, OPPONENT
+from .evaluation import evaluate, SIGN
+from .minimax_utils import get_optimized_legal_moves, get_capture_moves, move_ordering, lazy_move_ordering, \
+                           is_capture, update_heuristics, clear_heuristics, MOVE_BUFFERS, MAX_PLY
+from .transposition import TRANSPOSITION_TABLE, EXACT, LOWER_BOUND, UPPER_BOUND
 
 # Constants
 NULL_WINDOW: float = 1
 TIME_LIMIT_PER_MOVE: float = 18
+NULL_MOVE_REDUCTION: int = 2
+NULL_MOVE_MIN_DEPTH: int = 3
+LMR_REDUCTION      : int = 1
+LMR_MIN_DEPTH      : int = 3
+LMR_MIN_INDEX      : int = 3
+ASPIRATION_WINDOW  : float = 10
+QUIESCENCE_DEPTH   : int = 2
+ROOT_WORKERS       : int = 1    # the number of processes searching the root, 1 to search sequentially
+TIME_CHECK_MASK    : int = 15   # the time is checked once every (TIME_CHECK_MASK + 1) nodes
+
+# the number of nodes searched by Negamax, to sample the time
+NODE_COUNTER: list[int] = [0]
 
 
 def negamax(board: Board, depth: int, color: PlayerColor, full=False, time_lim=TIME_LIMIT_PER_MOVE) -> Action:
@@ -35,6 +52,66 @@ def negamax(board: Board, depth: int, color: PlayerColor, full=False, time_lim=T
     is the agent with specified color's turn. There's no performance difference between negamax
     and minimax, however.
 
+    The search is iteratively deepened up to the depth limit. Each iteration fills the transposition
+    table with the best actions found, which are then searched first by the next, deeper iteration.
+    The table is kept from previous turns, so a search also starts from what the previous searches
+    have found of the board states that are still reachable.
+    If time runs out, the action of the deepest completed iteration is returned. Every iteration after
+    the first is searched with an aspiration window around the score of the previous one, and only
+    searched again with a wider window if the score falls outside of it.
+
+    Args:
+        board    : the board
+        depth    : the search depth limit
+        color    : the agent's color
+        full     : * `True` to set move reduction optimization,
+                   * `False` to get actual all possible legal moves
+        time_lim : the maximum allowed time to return an action
+
+    Returns:
+        the action to take for agent
+    """
+    if ROOT_WORKERS > 1:
+        return parallel_negamax(board, depth, color, full, time_lim, ROOT_WORKERS)
+    timer  = time()
+    action = None
+    score  = None
+    clear_heuristics()
+    for curr_depth in range(1, depth + 1):
+        # aspiration window - search narrowly around the score of the previous iteration
+        if score is None or abs(score) == INF:
+            alpha, beta = -INF, INF
+        else:
+            alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+        curr_score, curr_action, _ = alphabeta_negamax(board, color, curr_depth, curr_depth, None,
+                                                       alpha, beta, timer, full, time_lim)
+        # the actual score lies outside the window, so search again with the failed side widened
+        if (curr_score <= alpha or curr_score >= beta) and time() - timer < time_lim:
+            if curr_score <= alpha:
+                alpha = -INF
+            else:
+                beta = INF
+            curr_score, curr_action, _ = alphabeta_negamax(board, color, curr_depth, curr_depth, None,
+                                                           alpha, beta, timer, full, time_lim)
+        # an iteration cut short by time is discarded, unless no iteration has completed
+        if time() - timer >= time_lim:
+            if action is None:
+                action = curr_action
+            break
+        score  = curr_score
+        action = curr_action
+    assert_action(action)
+    return action
+
+
+def parallel_negamax(board: Board, depth: int, color: PlayerColor, full=False, time_lim=TIME_LIMIT_PER_MOVE,
+                     workers=ROOT_WORKERS) -> Action:
+    """
+    Root parallelization of Negamax. The actions at the root are split across a pool of processes,
+    each searching the subtrees of its actions independently with their own transposition table,
+    and the action of the best subtree is taken. Since subtrees do not share their search windows,
+    each is searched with the full window, which is only worthwhile given enough processes.
+
     Args:
         board    : the board
         depth    : the search depth limit
@@ -42,18 +119,67 @@ def negamax(board: Board, depth: int, color: PlayerColor, full=False, time_lim=T
         full     : * `True` to set move reduction optimization,
                    * `False` to get actual all possible legal moves
         time_lim : the maximum allowed time to return an action
+        workers  : the number of processes
 
     Returns:
         the action to take for agent
     """
-    alpha = -INF
-    beta  = INF
     timer = time()
-    _, action, _ = alphabeta_negamax(board, color, depth, depth, None, alpha, beta, timer, full, time_lim)
+    legal_moves, endgame = get_optimized_legal_moves(board, color, full)
+    ordered_moves = move_ordering(board, color, legal_moves) if not endgame else legal_moves
+    with Pool(workers) as pool:
+        scores = pool.starmap(search_subtree, [(board, color, action, depth, timer, full, time_lim)
+                                               for action in ordered_moves])
+
+    # the first of the best actions, in order, is taken
+    best   = max(range(len(ordered_moves)), key=lambda index: scores[index])
+    action = ordered_moves[best]
     assert_action(action)
     return action
 
 
+def search_subtree(board    : Board,
+                   color    : PlayerColor,
+                   action   : Action,
+                   depth    : int,
+                   timer    : float,
+                   full     = False,
+                   time_lim = TIME_LIMIT_PER_MOVE
+                   ) -> float:
+    """
+    Search the subtree of a root action, iteratively deepened as with Negamax. It is run by each of
+    the processes of root parallelization.
+
+    Args:
+        board    : the board, before the action is applied
+        color    : the agent's color
+        action   : the root action
+        depth    : the search depth limit, including the root action
+        timer    : the timer of the root search
+        full     : * `True` to set move reduction optimization,
+                   * `False` to get actual all possible legal moves
+        time_lim : the maximum allowed time to return an action
+
+    Returns:
+        the score of the action, for the agent
+    """
+    TRANSPOSITION_TABLE.clear()
+    clear_heuristics()
+    board.apply_action(action, concrete=False)
+    score = None
+    for curr_depth in range(depth):
+        curr_score, _, _ = alphabeta_negamax(board, OPPONENT[color], curr_depth, curr_depth + 1, action,
+                                             -INF, INF, timer, full, time_lim)
+        # an iteration cut short by time is discarded, unless no iteration has completed
+        if time() - timer >= time_lim:
+            if score is None:
+                score = curr_score
+            break
+        score = curr_score
+    board.undo_action()
+    return -score
+
+
 def alphabeta_negamax(board    : Board,
                       color    : PlayerColor,
                       depth    : int,
@@ -63,7 +189,8 @@ def alphabeta_negamax(board    : Board,
                       beta     : float,
                       timer    : float,
                       full     = False,
-                      time_lim = TIME_LIMIT_PER_MOVE
+                      time_lim = TIME_LIMIT_PER_MOVE,
+                      allow_null = True
                       ) -> (float, Action, bool):
     """
     Alpha-beta pruning for Negamax search algorithm.
@@ -84,6 +211,7 @@ def alphabeta_negamax(board    : Board,
         full     : * `True` to set move reduction optimization,
                    * `False` to get actual all possible legal moves
         time_lim : the maximum allowed time to return an action
+        allow_null : `True` to allow null-move pruning, `False` right after a null move
 
     Returns:
         * evaluated score of the board and the action to be made
@@ -91,42 +219,147 @@ def alphabeta_negamax(board    : Board,
         * boolean premature stopping condition
     """
     # reached depth limit, or terminal node
-    ret   = None
-    score = 0           # arbitrary score which will be changed later anyway, as long ret is None
-    end   = time()
-    stop  = end - timer >= time_lim
+    NODE_COUNTER[0] += 1
+    stop = NODE_COUNTER[0] & TIME_CHECK_MASK == 0 and time() - timer >= time_lim
     if depth == 0 or board.game_over or stop:
-        stop = depth >= ceil - 1 or stop
-        sign = 1 if color == MAXIMIZE_PLAYER else -1
-        return sign * evaluate(board), action, stop
+        stop = (board.game_over and depth >= ceil - 1) or stop
+        # the depth limit is extended by quiescence search, so captures are not cut off halfway
+        if depth == 0 and not board.game_over and not stop:
+            return quiescence(board, color, alpha, beta, QUIESCENCE_DEPTH), action, stop
+        return SIGN[color] * evaluate(board), action, stop
+
+    # transposition table lookup - the stored score is only usable if searched at least as deep,
+    # and the root always searches its moves in order to return an action
+    alpha_orig = alpha
+    key        = board.__hash__()
+    entry      = TRANSPOSITION_TABLE.probe(key)
+    tt_action  = None
+    if entry is not None:
+        tt_action = entry.action
+        if entry.depth >= depth and depth < ceil:
+            if entry.flag == EXACT:
+                return entry.score, entry.action, False
+            elif entry.flag == LOWER_BOUND:
+                alpha = max(alpha, entry.score)
+            else:
+                beta = min(beta, entry.score)
+            if alpha >= beta:
+                return entry.score, entry.action, False
+
+    # for each child node of board, generated into the preallocated list of the ply
+    ply = ceil - depth
+    buffer = MOVE_BUFFERS[ply] if ply < MAX_PLY else None
+    legal_moves, endgame = get_optimized_legal_moves(board, color, full, buffer)
+
+    # null-move pruning - if passing the turn to the opponent still fails high in a reduced, narrow
+    # window search, then the node almost certainly fails high as well (not applied on endgame)
+    if allow_null and not endgame and NULL_MOVE_MIN_DEPTH <= depth < ceil and beta < INF:
+        board.pass_turn()
+        curr, _, stop = alphabeta_negamax(board, OPPONENT[color], depth - 1 - NULL_MOVE_REDUCTION, ceil,
+                                          None, -beta, -beta + NULL_WINDOW, timer, full, time_lim,
+                                          allow_null=False)
+        board.undo_action()
+        if not stop and -curr >= beta:
+            return beta, None, False
 
-    # for each child node of board
-    legal_moves, endgame = get_optimized_legal_moves(board, color, full)
-    ordered_moves = move_ordering(board, color, legal_moves) if not endgame else legal_moves
-    for action in ordered_moves:
+    ordered_moves = lazy_move_ordering(board, color, legal_moves, tt_action, ply) if not endgame else legal_moves
+
+    ret   = None
+    score = -INF
+
+    # bound once, rather than looked up again for every child node
+    opponent     = OPPONENT[color]
+    apply_action = board.apply_action
+    undo_action  = board.undo_action
+    for index, action in enumerate(ordered_moves):
+
+        # the first action is kept if no action scores above -INF, viz. every action loses
+        if index == 0:
+            ret = action
+
+        # late move reduction - late quiet actions are unlikely to improve alpha, so they are first
+        # searched at a reduced depth with a narrow window, and only fully searched if they do
+        reduced = not endgame and index >= LMR_MIN_INDEX and depth >= LMR_MIN_DEPTH and \
+            alpha > -INF and not is_capture(board, color, action)
 
         # apply action
-        board.apply_action(action, concrete=False)
-        curr, _, stop = alphabeta_negamax(board, color.opponent, depth - 1, ceil, action,
-                                          -beta, -alpha, timer, full)
-        curr = -curr
+        apply_action(action, concrete=False)
+        if reduced:
+            curr, _, stop = alphabeta_negamax(board, opponent, depth - 1 - LMR_REDUCTION, ceil,
+                                              action, -alpha - NULL_WINDOW, -alpha, timer, full, time_lim)
+            curr = -curr
+        if not reduced or (curr > alpha and not stop):
+            curr, _, stop = alphabeta_negamax(board, opponent, depth - 1, ceil, action,
+                                              -beta, -alpha, timer, full, time_lim)
+            curr = -curr
         # undo after finishing
-        board.undo_action()
+        undo_action()
 
         # update score and, likewise, alpha
-        if curr > score or ret is None:
+        if curr > score:
             score = curr
-            ret = action
-        alpha = max(alpha, score)
+            ret   = action
+            if score > alpha:
+                alpha = score
 
         # cutoff / stop prematurely
-        if stop or alpha >= beta:
+        if stop:
             break
+        if alpha >= beta:
+            update_heuristics(board, color, action, ply, depth)
+            break
+
+    # store the result, unless the search was stopped prematurely
+    if not stop:
+        if score <= alpha_orig:
+            flag = UPPER_BOUND
+        elif score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        TRANSPOSITION_TABLE.store(key, depth, score, flag, ret)
 
     # return evaluated score and corresponding action
     return score, ret, stop
 
 
+def quiescence(board: Board, color: PlayerColor, alpha: float, beta: float, depth: int) -> float:
+    """
+    Quiescence search, extending the search at the depth limit with only the actions that capture,
+    until the board is quiet. Otherwise, a board in the middle of a series of captures would be
+    evaluated as if the captures had finished (the horizon effect). The player may also choose not
+    to capture at all, so the board's evaluation is taken as the lower bound of the score.
+
+    Args:
+        board : the board
+        color : the current turn of player, specified by player's color
+        alpha : move that improves player's position
+        beta  : move that improves opponent's position
+        depth : the remaining number of captures to search
+
+    Returns:
+        evaluated score of the board
+    """
+    score = SIGN[color] * evaluate(board)
+    if depth == 0 or board.game_over or score >= beta:
+        return score
+    alpha = max(alpha, score)
+
+    # for each capturing action, with the greatest captures first
+    opponent     = OPPONENT[color]
+    apply_action = board.apply_action
+    undo_action  = board.undo_action
+    for action in move_ordering(board, color, get_capture_moves(board, color)):
+        apply_action(action, concrete=False)
+        curr = -quiescence(board, opponent, -beta, -alpha, depth - 1)
+        undo_action()
+        score = max(score, curr)
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+    return score
+
+
 def negascout(board: Board, depth: int, color: PlayerColor, full=False) -> Action:
     """
     NegaScout search algorithm to find the next action to take for the agent. It is called when it
@@ -138,6 +371,9 @@ def negascout(board: Board, depth: int, color: PlayerColor, full=False) -> Actio
         Reinefeld, A. (1983). `An Improvement to the Scout Tree-Search Algorithm`
         [Journal of the International Computer Games Association] https://doi.org/10.3233/ICG-1983-6402
 
+    As with Negamax, the search is iteratively deepened up to the depth limit, with each iteration
+    ordering the next by the best actions stored in the transposition table.
+
     Args:
         board: the board
         depth: the search depth limit
@@ -148,9 +384,12 @@ def negascout(board: Board, depth: int, color: PlayerColor, full=False) -> Actio
     Returns:
         the action to take for agent
     """
-    alpha = -INF
-    beta  = INF
-    _, action, _ = alphabeta_pvs(board, color, depth, depth, None, alpha, beta, full)
+    alpha  = -INF
+    beta   = INF
+    action = None
+    clear_heuristics()
+    for curr_depth in range(1, depth + 1):
+        _, action, _ = alphabeta_pvs(board, color, curr_depth, curr_depth, None, alpha, beta, full)
     assert_action(action)
     return action
 
@@ -193,38 +432,68 @@ def alphabeta_pvs(board  : Board,
     """
     # reached depth limit, or terminal node
     if depth == 0 or board.game_over:
-        stop = depth >= ceil - 1
-        sign = 1 if color == MAXIMIZE_PLAYER else -1
-        return sign * evaluate(board), action, stop
-
-    # generating optimized moves and order them
-    legal_moves, endgame = get_optimized_legal_moves(board, color, full)
-    ordered_moves = move_ordering(board, color, legal_moves) if not endgame else legal_moves
-
-    # for each child node of board
+        stop = board.game_over and depth >= ceil - 1
+        return SIGN[color] * evaluate(board), action, stop
+
+    # transposition table lookup, as with Negamax
+    alpha_orig = alpha
+    key        = board.__hash__()
+    entry      = TRANSPOSITION_TABLE.probe(key)
+    tt_action  = None
+    if entry is not None:
+        tt_action = entry.action
+        if entry.depth >= depth and depth < ceil:
+            if entry.flag == EXACT:
+                return entry.score, entry.action, False
+            elif entry.flag == LOWER_BOUND:
+                alpha = max(alpha, entry.score)
+            else:
+                beta = min(beta, entry.score)
+            if alpha >= beta:
+                return entry.score, entry.action, False
+
+    # generating optimized moves into the preallocated list of the ply, and order them
+    ply = ceil - depth
+    buffer = MOVE_BUFFERS[ply] if ply < MAX_PLY else None
+    legal_moves, endgame = get_optimized_legal_moves(board, color, full, buffer)
+    ordered_moves = lazy_move_ordering(board, color, legal_moves, tt_action, ply) if not endgame else legal_moves
+
+    # for each child node of board, with lookups bound once as with Negamax
     b    = beta
     ret  : Action = None
     stop : bool   = False
-    for action in ordered_moves:
+    opponent     = OPPONENT[color]
+    apply_action = board.apply_action
+    undo_action  = board.undo_action
+    for index, action in enumerate(ordered_moves):
+
+        # late move reduction, as with Negamax
+        reduced = not endgame and index >= LMR_MIN_INDEX and depth >= LMR_MIN_DEPTH and \
+            alpha > -INF and not is_capture(board, color, action)
 
         # search with updated search window a and b
-        board.apply_action(action, concrete=False)
-        score, _, stop = alphabeta_pvs(board, color.opponent, depth - 1, ceil, action,
-                                       -b, -alpha, full)
-        score = -score
+        apply_action(action, concrete=False)
+        if reduced:
+            score, _, stop = alphabeta_pvs(board, opponent, depth - 1 - LMR_REDUCTION, ceil, action,
+                                           -b, -alpha, full)
+            score = -score
+        if not reduced or score > alpha:
+            score, _, stop = alphabeta_pvs(board, opponent, depth - 1, ceil, action,
+                                           -b, -alpha, full)
+            score = -score
 
         # first action - estimated best action
-        if action is ordered_moves[0]:
+        if index == 0:
             ret = action
 
         # subsequent actions - if within range, search full alpha-beta window
         elif alpha < score < beta:
-            score, _, stop = alphabeta_pvs(board, color.opponent, depth - 1, ceil, action,
+            score, _, stop = alphabeta_pvs(board, opponent, depth - 1, ceil, action,
                                            -beta, -alpha, full)
             score = -score
 
         # undo after finishing
-        board.undo_action()
+        undo_action()
 
         # update alpha (maximize score) and return action
         if score > alpha:
@@ -232,9 +501,21 @@ def alphabeta_pvs(board  : Board,
             ret   = action
 
         # cutoff / stop prematurely, and update search window
+        if alpha >= beta and not stop:
+            update_heuristics(board, color, action, ply, depth)
         if alpha >= beta or stop:
             break
         b = alpha + NULL_WINDOW
 
+    # store the result, unless the search was stopped prematurely
+    if not stop:
+        if alpha <= alpha_orig:
+            flag = UPPER_BOUND
+        elif alpha >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        TRANSPOSITION_TABLE.store(key, depth, alpha, flag, ret)
+
     # return evaluated score and corresponding action
     return alpha, ret, stop
@@ -0,0 +1,155 @@
+"""
+Module:
+    ``transposition.py``
+
+Authors:
+    The Duy Nguyen (1100548)
+
+Purpose:
+    Transposition table for the Negamax and NegaScout search algorithms, storing the results of
+    already searched board states so that transpositions do not have to be searched again.
+
+Notes:
+    Entries are keyed by the board's Zobrist hash, which the board maintains incrementally. Each
+    entry records the depth it was searched to, its score, whether that score is exact or only a
+    bound of the search window, and the best action found. The table is bounded in size, and when
+    full, the oldest entry is evicted first. The table is not cleared between turns, since the board
+    states searched on one turn are largely searched again on the next, and the entries of previous
+    turns are the first to be evicted.
+
+    An entry also caches the static evaluation of its board state, so that a recurring board state
+    is not evaluated again. A board state only evaluated, but not yet searched, has an entry with
+    depth ``UNSEARCHED``, which is never used for cutoffs.
+"""
+
+from dataclasses import dataclass
+from referee.game import Action
+
+# Constants
+EXACT       : int = 0
+LOWER_BOUND : int = 1
+UPPER_BOUND : int = 2
+TABLE_SIZE  : int = 1 << 16
+UNSEARCHED  : int = -1
+
+
+@dataclass(slots=True)
+class TableEntry:
+    """
+    Class represents a single entry of the transposition table.
+    Attributes:
+        depth  : the remaining depth the board state was searched to
+        score  : the score of the board state
+        flag   : whether the score is exact, a lower bound or an upper bound
+        action : the best action found from the board state
+        static : the static evaluation of the board state, if evaluated
+    """
+    depth  : int
+    score  : float
+    flag   : int
+    action : Action | None
+    static : float | None = None
+
+
+class TranspositionTable:
+    """
+    Bounded transposition table, mapping board hashed values to their table entries.
+    Attributes:
+        _entries : the table entries, in order of insertion
+        _size    : the maximum number of entries
+    """
+    __slots__ = [
+        "_entries",
+        "_size"
+    ]
+
+    def __init__(self, size: int = TABLE_SIZE):
+        """
+        Transposition table constructor.
+        Args:
+            size: the maximum number of entries, default = TABLE_SIZE
+        """
+        self._entries: dict[int, TableEntry] = {}
+        self._size   : int = size
+
+    def __len__(self) -> int:
+        """
+        Get the number of entries stored within the table.
+        """
+        return len(self._entries)
+
+    def probe(self, key: int) -> TableEntry | None:
+        """
+        Look up the entry of a board state.
+        Args:
+            key: the board's hashed value
+        Returns:
+            the entry if the board state has been stored, otherwise `None`
+        """
+        return self._entries.get(key)
+
+    def store(self, key: int, depth: int, score: float, flag: int, action: Action | None):
+        """
+        Store the search result of a board state, replacing the result of any existing entry of the
+        same state. If the table is full, the oldest entry is evicted.
+        Args:
+            key    : the board's hashed value
+            depth  : the remaining depth the board state was searched to
+            score  : the score of the board state
+            flag   : whether the score is exact, a lower bound or an upper bound
+            action : the best action found from the board state
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._insert(key, TableEntry(depth, score, flag, action))
+            return
+        entry.depth  = depth
+        entry.score  = score
+        entry.flag   = flag
+        entry.action = action
+
+    def probe_static(self, key: int) -> float | None:
+        """
+        Look up the cached static evaluation of a board state.
+        Args:
+            key: the board's hashed value
+        Returns:
+            the static evaluation if the board state has been evaluated, otherwise `None`
+        """
+        entry = self._entries.get(key)
+        return None if entry is None else entry.static
+
+    def store_static(self, key: int, static: float):
+        """
+        Cache the static evaluation of a board state, on its existing entry if any.
+        Args:
+            key    : the board's hashed value
+            static : the static evaluation of the board state
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._insert(key, TableEntry(UNSEARCHED, static, EXACT, None, static))
+            return
+        entry.static = static
+
+    def _insert(self, key: int, entry: TableEntry):
+        """
+        Insert a new entry, evicting the oldest entry if the table is full.
+        Args:
+            key   : the board's hashed value
+            entry : the new entry
+        """
+        entries = self._entries
+        if len(entries) >= self._size:
+            del entries[next(iter(entries))]
+        entries[key] = entry
+
+    def clear(self):
+        """
+        Remove every entry from the table.
+        """
+        self._entries.clear()
+
+
+# table shared by the search algorithms
+TRANSPOSITION_TABLE = TranspositionTable()
@@ -15,8 +15,9 @@ Notes:
     pressure, and is able to control allowed time per move before cut-off.
 """
 
-from referee.game import PlayerColor, Action, SpawnAction, HexPos, HexDir
-from ..game import Board
+from referee.game import PlayerColor, Action, SpawnAction, HexPos
+from ..game import Board, NEIGHBOUR_MASKS
+from .search_utils import SPAWN_ACTIONS
 from .negamax import negamax, TIME_LIMIT_PER_MOVE
 
 # Depth limit for NegaScout
@@ -25,6 +26,9 @@ REDUCED_DEPTH : int   = 2
 MIN_TIME_DIFF : float = 5
 TIME_THRESHOLD: float = 15
 
+# the opening action of the first player, at the center of the board
+OPENING_ACTION: Action = SpawnAction(HexPos(3, 3))
+
 
 def search(board: Board, color: PlayerColor, player_time) -> Action:
     """
@@ -40,12 +44,13 @@ def search(board: Board, color: PlayerColor, player_time) -> Action:
         the action to take for agent
     """
     if board.turn_count < 1:
-        return SpawnAction(HexPos(3, 3))
+        return OPENING_ACTION
     elif board.turn_count < 2:
-        for cell in board.get_cells():
-            pos = cell.pos
-            if not board.pos_occupied(pos) and all([not board.pos_occupied(pos + dir) for dir in HexDir]):
-                return SpawnAction(pos)
+        # spawn on the first cell that is neither occupied nor adjacent to the opponent's piece
+        occupied = board.bitboard(PlayerColor.RED) | board.bitboard(PlayerColor.BLUE)
+        for index, neighbours in enumerate(NEIGHBOUR_MASKS):
+            if not (occupied >> index) & 1 and not neighbours & occupied:
+                return SPAWN_ACTIONS[index]
 
     # desperation not under time pressure yet, but under allowed move time
     depth = DEPTH
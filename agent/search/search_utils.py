@@ -12,11 +12,44 @@ Purpose:
 Notes:
 """
 
-from ..game import Board
-from referee.game import HexDir, PlayerColor, Action, SpawnAction, SpreadAction, MAX_TOTAL_POWER
+from ..game import Board, BOARD_POSITIONS, HEX_DIRECTIONS, NUM_DIRECTIONS, EMPTY_POWER, pos_index
+from referee.game import PlayerColor, Action, SpawnAction, SpreadAction, MAX_TOTAL_POWER
 
+# every possible action, created once and shared since actions are immutable: the spawn action of
+# each cell, and the spread action of each cell and direction (at index * NUM_DIRECTIONS + direction)
+SPAWN_ACTIONS : list[SpawnAction]  = [SpawnAction(pos) for pos in BOARD_POSITIONS]
+SPREAD_ACTIONS: list[SpreadAction] = [SpreadAction(pos, dir) for pos in BOARD_POSITIONS for dir in HEX_DIRECTIONS]
 
-def get_legal_moves(board: Board, color: PlayerColor) -> list[Action]:
+# the index of every shared action, keyed by the action's identity since hashing an action is slow:
+# spread actions keep their index, and spawn actions follow after them
+NUM_ACTIONS   : int            = len(SPREAD_ACTIONS) + len(SPAWN_ACTIONS)
+ACTION_INDICES: dict[int, int] = {id(action): index for index, action in
+                                  enumerate(SPREAD_ACTIONS + SPAWN_ACTIONS)}
+
+
+def action_index(action: Action) -> int:
+    """
+    Get the index of an action, from 0 to ``NUM_ACTIONS``, as a cheap integer key of the action.
+    Args:
+        action: specified action
+    Returns:
+        the action's index
+    """
+    index = ACTION_INDICES.get(id(action))
+    if index is not None:
+        return index
+
+    # the action is not one of the shared actions, so its index is computed from its position
+    match action:
+        case SpawnAction(cell):
+            return len(SPREAD_ACTIONS) + pos_index(cell)
+        case SpreadAction(cell, direction):
+            return pos_index(cell) * NUM_DIRECTIONS + HEX_DIRECTIONS.index(direction)
+        case _:
+            raise Exception("action_index: Action not of any type")
+
+
+def get_legal_moves(board: Board, color: PlayerColor, actions: list[Action] = None) -> list[Action]:
     """
     Get all possible legal moves of a specified player color from a specific state of the board.
     There are several optimizations made for this function in order reduce the number of legal
@@ -25,27 +58,32 @@ def get_legal_moves(board: Board, color: PlayerColor) -> list[Action]:
     However, in the case when player is overwhelmed, then full will be forcefully set to True.
 
     Args:
-        board : specified board
-        color : specified player's color
+        board   : specified board
+        color   : specified player's color
+        actions : the list to be filled with the actions, default = None for a new list
     Returns:
         list of all actions that could be applied to board,
         and boolean indicating whether endgame has been reached
     """
 
     # if the actual player side is being overwhelmed, forcefully get all legal moves possible
-    actions: list[Action] = []
+    if actions is None:
+        actions = []
 
     # for every possible move from a given board state, including SPAWN and SPREAD
-    for cell in board.get_cells():
+    colors    = board.colors
+    powers    = board.powers
+    can_spawn = board.total_power() < MAX_TOTAL_POWER
+    for index, cell_color in enumerate(colors):
 
         # append spawn actions - always add when full, otherwise add on condition
-        pos = cell.pos
-        if not board.pos_occupied(pos):
-            if board.total_power() < MAX_TOTAL_POWER:
-                actions.append(SpawnAction(pos))
+        if powers[index] == EMPTY_POWER:
+            if can_spawn:
+                actions.append(SPAWN_ACTIONS[index])
 
         # append spread actions for every direction
-        elif board[pos].color == color:
-            actions.extend([SpreadAction(pos, dir) for dir in HexDir])
+        elif cell_color == color:
+            start = index * NUM_DIRECTIONS
+            actions.extend(SPREAD_ACTIONS[start:start + NUM_DIRECTIONS])
     assert len(actions) > 0
     return actions
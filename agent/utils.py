@@ -14,6 +14,12 @@ Notes:
     fully delegated to referee.
 """
 
+# the referee data printout, formatted once per call with the remaining time and space
+REFEREE_TEMPLATE: str = "  ---------------------------------\n" \
+                        "  Time remaining  (s)  : {}\n" \
+                        "  Space remaining (Mb) : {}\n" \
+                        "  ---------------------------------"
+
 
 def print_referee(referee: dict):
     """
@@ -25,8 +31,4 @@ def print_referee(referee: dict):
     space = referee["space_remaining"]
     time_format  = '{:09.6f}'.format(round(time , 6)) if time is not None else time
     space_format = '{:09.6f}'.format(round(space, 6)) if space is not None else space
-    logs  = f"  ---------------------------------\n" \
-            f"  Time remaining  (s)  : {time_format}\n" \
-            f"  Space remaining (Mb) : {space_format}\n" \
-            f"  ---------------------------------"
-    print(logs)
+    print(REFEREE_TEMPLATE.format(time_format, space_format))
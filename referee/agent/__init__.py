@@ -30,6 +30,16 @@ class AgentProxyPlayer(Player):
     are run in a separate process to the referee, so that they cannot interfere with the
     referee's execution. See the AgentProcess (process.py) class for more details.
     """
+    __slots__ = [
+        "_pkg",
+        "_cls",
+        "_name",
+        "_agent",
+        "_log",
+        "_ret_symbol",
+        "_InterceptExc"
+    ]
+
     def __init__(
             self,
             name               : str,
@@ -139,8 +149,9 @@ class AgentProxyPlayer(Player):
             action: Action = await self._agent.action()
 
         # update per that response, which is the player's action
-        self._log.debug(f"{self._ret_symbol} {action!r}")
-        self._log.debug(self._summarise_status(self._agent.status))
+        self._log.debug("%s %r", self._ret_symbol, action)
+        if self._log.debug_enabled:
+            self._log.debug(self._summarise_status(self._agent.status))
         return action
 
     async def turn(self, color: PlayerColor, action: Action):
@@ -151,11 +162,12 @@ class AgentProxyPlayer(Player):
             color  : player's color
             action : the action that player just made
         """
-        self._log.debug(f"call 'turn({color!r}, {action!r})'...")
+        self._log.debug("call 'turn(%r, %r)'...", color, action)
 
         with self._intercept_exc():
             await self._agent.turn(color, action)
-        self._log.debug(self._summarise_status(self._agent.status))
+        if self._log.debug_enabled:
+            self._log.debug(self._summarise_status(self._agent.status))
 
     def _summarise_status(self, status: AsyncProcessStatus | None):
         """
@@ -70,8 +70,7 @@ class RemoteProcessClassClient:
         assert self._proc is not None
         assert self._proc.stdout is not None
         # Read reply from subprocess (with hard timeout)
-        self._log.debug(
-            f"waiting for reply from subprocess {self._proc.pid} (stdout)")
+        self._log.debug("waiting for reply from subprocess %d (stdout)", self._proc.pid)
         try:
             line = await wait_for(
                 self._proc.stdout.readline(),
@@ -193,10 +192,7 @@ class RemoteProcessClassClient:
             assert self._proc.stdout is not None
 
             # Send method call, wait for result
-            self._log.debug(
-                f"send method call request to subprocess "
-                f"{self._proc.pid} (stdin)"
-            )
+            self._log.debug("send method call request to subprocess %d (stdin)", self._proc.pid)
             self._proc.stdin.write(m_pickle((name, args, kwargs)))
             return await self._recv_reply()
 
@@ -11,6 +11,7 @@ Notes:
     increase interactivity.
 """
 
+from asyncio import gather
 from dataclasses import dataclass
 from typing import AsyncGenerator
 
@@ -127,9 +128,17 @@ async def game(
                         winner_color = board.winner_color
                         break
 
-                    # Update both players.
-                    await p1.turn(turn_color, action)
-                    await p2.turn(turn_color, action)
+                    # Update both players. Their updates are independent, so
+                    # they are awaited together, but an error is still raised
+                    # for the first player before the second.
+                    results = await gather(
+                        p1.turn(turn_color, action),
+                        p2.turn(turn_color, action),
+                        return_exceptions=True
+                    )
+                    for result in results:
+                        if isinstance(result, BaseException):
+                            raise result
 
     except PlayerException as e:
         if isinstance(e, IllegalActionException):
@@ -17,10 +17,15 @@ Notes:
 
     This board representation is designed to be used internally by the referee for the purposes of
     validating actions and determining the result of the game.
+
+    The board state is stored as two flat lists, the color and the power of each cell, both indexed
+    by ``r * BOARD_N + q``. Cell states are only created when they are requested. The board also
+    keeps a Zobrist hash of its state, a bitboard of its occupied cells and the total power of each
+    player, all updated with every applied and undone action.
 """
 
-from collections import defaultdict
 from dataclasses import dataclass
+from random import Random
 
 from .hex import HexPos, HexDir
 from .player import PlayerColor
@@ -28,6 +33,22 @@ from .actions import Action, SpawnAction, SpreadAction
 from .exceptions import IllegalActionException
 from .constants import *
 
+# Zobrist hashing keys - one random key for each (cell, color, power) triplet, and one for the turn
+_ZOBRIST_SEED = 30024
+_ZOBRIST_BITS = 64
+_zobrist_random = Random(_ZOBRIST_SEED)
+_ZOBRIST_KEYS: dict[PlayerColor, list[int]] = {
+    color: [_zobrist_random.getrandbits(_ZOBRIST_BITS) for _ in range(BOARD_N * BOARD_N * MAX_CELL_POWER)]
+    for color in PlayerColor
+}
+_ZOBRIST_TURN: int = _zobrist_random.getrandbits(_ZOBRIST_BITS)
+
+# the opponent of each player, looked up without going through the enum property
+_OPPONENT: dict[PlayerColor, PlayerColor] = {
+    PlayerColor.RED  : PlayerColor.BLUE,
+    PlayerColor.BLUE : PlayerColor.RED
+}
+
 
 @dataclass(frozen=True, slots=True)
 class CellState:
@@ -52,6 +73,29 @@ class CellState:
         yield self.player
         yield self.power
 
+    @classmethod
+    def of(cls, player: PlayerColor | None, power: int) -> 'CellState':
+        """
+        Get the cell state of a player and power, sharing the interned instance for all valid
+        states instead of constructing a new one.
+
+        Args:
+            player : the player's color occupying the cell, if any
+            power  : the player's power occupying the cell
+        Returns:
+            the cell state
+        """
+        cell = _CELL_STATES.get((player, power))
+        return cls(player, power) if cell is None else cell
+
+
+# interned cell states - the empty cell, and each player with each valid power
+_CELL_STATES: dict[tuple[PlayerColor | None, int], CellState] = {
+    (None, 0): CellState(None, 0),
+    **{(player, power): CellState(player, power)
+       for player in PlayerColor for power in range(1, MAX_CELL_POWER + 1)}
+}
+
 
 @dataclass(frozen=True, slots=True)
 class CellMutation:
@@ -77,10 +121,10 @@ class BoardMutation:
     the state of the board as a result of an action.
     Attributes:
         action: action which leads to board mutation
-        cell_mutations: list of cell mutations as a result of action
+        cell_mutations: tuple of cell mutations as a result of action, in order of mutation
     """
     action: Action
-    cell_mutations: set[CellMutation]
+    cell_mutations: tuple[CellMutation, ...]
 
     def __str__(self):
         return f"BoardMutation({self.cell_mutations})"
@@ -95,19 +139,65 @@ def _within_bounds(coord: HexPos) -> bool:
     Returns:
         `True` if within bounds, `False` if otherwise
     """
-    r, q = coord
-    return 0 <= r < BOARD_N and 0 <= q < BOARD_N
+    return 0 <= coord.r < BOARD_N and 0 <= coord.q < BOARD_N
+
+
+def _cell_index(pos: HexPos) -> int:
+    """
+    Get the index of a position within the flattened board.
+
+    Args:
+        pos: specified position
+    Returns:
+        the flattened index of the position
+    """
+    return pos.r * BOARD_N + pos.q
+
+
+# rendered text of an empty cell, an emptied cell and the spacing between cells
+_RENDER_EMPTY  : str = " .. "
+_RENDER_MUTATED: str = "[__]"
+_RENDER_SPACING: str = "    "
+
+# the position of each flattened cell index
+_CELL_POSITIONS: list[HexPos] = [HexPos.from_index(index) for index in range(BOARD_N * BOARD_N)]
+
+# the (r, q) step of each direction, in the order of HexDir
+_DIRECTION_STEPS: tuple[tuple[int, int], ...] = tuple(
+    (direction.value.r, direction.value.q) for direction in HexDir
+)
+
+# the cells reached by a spread from each flattened cell index, for each direction, by distance;
+# computed with plain integer steps, wrapping around the board as HexPos addition does
+_SPREAD_CELLS: dict[HexDir, list[tuple[int, ...]]] = {
+    direction: [
+        tuple(((r + dr * step) % BOARD_N) * BOARD_N + (q + dq * step) % BOARD_N
+              for step in range(1, MAX_CELL_POWER + 1))
+        for r in range(BOARD_N) for q in range(BOARD_N)
+    ]
+    for direction, (dr, dq) in zip(HexDir, _DIRECTION_STEPS)
+}
 
 
 class Board:
     """
-    Game's board representation. This is the board used by referee.
+    Game's board representation. This is the board used by referee. Rather than keeping a board
+    mutation for each action played, the history records the flattened index and previous state
+    of each mutated cell, along with the number of cells each action has mutated.
     """
     __slots__ = [
         "_mutable",
-        "_state",
+        "_colors",
+        "_powers",
         "_turn_color",
-        "_history"
+        "_history",
+        "_history_cells",
+        "_history_colors",
+        "_history_powers",
+        "_history_lens",
+        "_hash",
+        "_occupied",
+        "_color_pows"
     ]
 
     def __init__(self, initial_state=None):
@@ -118,10 +208,19 @@ class Board:
         """
         if initial_state is None:
             initial_state = {}
-        self._state: dict[HexPos, CellState] = defaultdict(lambda: CellState(None, 0))
-        self._state.update(initial_state)
+        self._colors: list[PlayerColor | None] = [None] * (BOARD_N * BOARD_N)
+        self._powers: list[int] = [0] * (BOARD_N * BOARD_N)
+        self._hash  : int = 0
+        self._occupied: int = 0
+        self._color_pows: list[int] = [0, 0]
+        for pos, cell in initial_state.items():
+            self._set_cell(_cell_index(pos), cell.player, cell.power)
         self._turn_color: PlayerColor = PlayerColor.RED
-        self._history: list[BoardMutation] = []
+        self._history: list[Action] = []
+        self._history_cells : list[int] = []
+        self._history_colors: list[PlayerColor | None] = []
+        self._history_powers: list[int] = []
+        self._history_lens  : list[int] = []
 
     def __getitem__(self, pos: HexPos) -> CellState:
         """
@@ -133,7 +232,8 @@ class Board:
         """
         if not _within_bounds(pos):
             raise IndexError(f"Cell position '{pos}' is invalid.")
-        return self._state[pos]
+        index = _cell_index(pos)
+        return CellState.of(self._colors[index], self._powers[index])
 
     def apply_action(self, action: Action):
         """
@@ -143,18 +243,18 @@ class Board:
         Args:
             action: the to be applied action
         """
-        match action:
-            case SpawnAction():
-                res_action = self._resolve_spawn_action(action)
-            case SpreadAction():
-                res_action = self._resolve_spread_action(action)
-            case _:
-                raise IllegalActionException(
-                    f"Unknown action {action}", self._turn_color)
-        for mutation in res_action.cell_mutations:
-            self._state[mutation.cell] = mutation.next
-        self._history.append(res_action)
-        self._turn_color = self._turn_color.opponent
+        # dispatch on the exact action type, so that the validation need not check it again
+        action_type = type(action)
+        if action_type is SpawnAction:
+            self._spawn(self._resolve_spawn_action(action))
+        elif action_type is SpreadAction:
+            self._spread(self._resolve_spread_action(action), action.direction)
+        else:
+            raise IllegalActionException(
+                f"Unknown action {action}", self._turn_color)
+        self._history.append(action)
+        self._turn_color = _OPPONENT[self._turn_color]
+        self._hash ^= _ZOBRIST_TURN
 
     def undo_action(self):
         """
@@ -164,10 +264,112 @@ class Board:
         if len(self._history) == 0:
             raise IndexError("No actions to undo.")
 
-        action: BoardMutation = self._history.pop()
-        for mutation in action.cell_mutations:
-            self._state[mutation.cell] = mutation.prev
-        self._turn_color = self._turn_color.opponent
+        self._history.pop()
+        cells, colors, powers = self._history_cells, self._history_colors, self._history_powers
+        for _ in range(self._history_lens.pop()):
+            self._set_cell(cells.pop(), colors.pop(), powers.pop())
+        self._turn_color = _OPPONENT[self._turn_color]
+        self._hash ^= _ZOBRIST_TURN
+
+    def _spawn(self, index: int):
+        """
+        Spawn a piece of the turn's color on a cell, without validation, recording the cell's
+        previous state in the history.
+
+        Args:
+            index: the flattened index of the spawned cell
+        """
+        self._mutate_cell(index, self._turn_color, 1)
+        self._history_lens.append(1)
+
+    def _spread(self, index: int, direction: HexDir):
+        """
+        Spread the piece of a cell towards a direction, without validation, recording the previous
+        states of all mutated cells in the history. A destination cell whose power would exceed
+        the maximum cell power is emptied instead.
+
+        Args:
+            index     : the flattened index of the spread cell
+            direction : the direction of the spread
+        """
+        color, colors, powers = self._turn_color, self._colors, self._powers
+        to_cells = _SPREAD_CELLS[direction][index][:powers[index]]
+
+        # record the previous states of the spread cell and all of its destination cells at once
+        mutated = (index, *to_cells)
+        self._history_cells.extend(mutated)
+        self._history_colors.extend([colors[cell] for cell in mutated])
+        self._history_powers.extend([powers[cell] for cell in mutated])
+        self._history_lens.append(len(mutated))
+
+        # the spread cell is emptied, and each destination cell gains a power of the turn's color,
+        # with the hash, occupancy and total power updated in place rather than through _set_cell
+        opponent = _OPPONENT[color]
+        keys, opponent_keys = _ZOBRIST_KEYS[color], _ZOBRIST_KEYS[opponent]
+        zobrist_hash, occupied = self._hash, self._occupied
+        power = powers[index]
+        zobrist_hash ^= keys[index * MAX_CELL_POWER + power - 1]
+        occupied &= ~(1 << index)
+        colors[index], powers[index] = None, 0
+        gained, captured = 0, 0
+        for to_cell in to_cells:
+            prev, prev_power = colors[to_cell], powers[to_cell]
+            offset = to_cell * MAX_CELL_POWER
+            if prev is color:
+                zobrist_hash ^= keys[offset + prev_power - 1]
+                gained -= prev_power
+            elif prev is not None:
+                zobrist_hash ^= opponent_keys[offset + prev_power - 1]
+                captured += prev_power
+            if prev_power < MAX_CELL_POWER:
+                zobrist_hash ^= keys[offset + prev_power]
+                occupied |= 1 << to_cell
+                colors[to_cell], powers[to_cell] = color, prev_power + 1
+                gained += prev_power + 1
+            else:
+                occupied &= ~(1 << to_cell)
+                colors[to_cell], powers[to_cell] = None, 0
+        self._hash, self._occupied = zobrist_hash, occupied
+        self._color_pows[color] += gained - power
+        self._color_pows[opponent] -= captured
+
+    def _mutate_cell(self, index: int, color: PlayerColor | None, power: int):
+        """
+        Set the state of a cell, recording its previous state in the history.
+
+        Args:
+            index : the flattened cell index
+            color : the new color of the cell, or `None` if empty
+            power : the new power of the cell
+        """
+        self._history_cells.append(index)
+        self._history_colors.append(self._colors[index])
+        self._history_powers.append(self._powers[index])
+        self._set_cell(index, color, power)
+
+    def _set_cell(self, index: int, color: PlayerColor | None, power: int):
+        """
+        Set the state of a cell by its flattened index, hashing out its previous state and
+        hashing in the new one, and updating its occupancy bit and the players' total power.
+
+        Args:
+            index : the flattened cell index
+            color : the new color of the cell, or `None` if empty
+            power : the new power of the cell
+        """
+        prev = self._colors[index]
+        if prev is not None:
+            prev_power = self._powers[index]
+            self._hash ^= _ZOBRIST_KEYS[prev][index * MAX_CELL_POWER + prev_power - 1]
+            self._color_pows[prev] -= prev_power
+        if color is not None:
+            self._hash ^= _ZOBRIST_KEYS[color][index * MAX_CELL_POWER + power - 1]
+            self._color_pows[color] += power
+            self._occupied |= 1 << index
+        else:
+            self._occupied &= ~(1 << index)
+        self._colors[index] = color
+        self._powers[index] = power
 
     def render(self, use_color=False, use_unicode=False) -> str:
         """
@@ -182,11 +384,6 @@ class Board:
         Returns:
             The string visualisation of the board
         """
-        """
-        Return a visualisation of the game board via a multiline string. The
-        layout corresponds to the axial coordinate system as described in the
-        game specification document.
-        """
         def apply_ansi(string, ansi_color=None, bold=False, mutated=False) -> str:
             """
             Apply ansi-format to string. Helper function.
@@ -211,45 +408,63 @@ class Board:
                 color_code = LogColor.BLUE
             return f"{bold_code}{color_code}{string}{LogColor.RESET_ALL}"
 
-        def is_mutated(cells_mutated: set[CellMutation], position: HexPos) -> bool:
-            """
-            Helper method (written by The Duy Nguyen - 1100548) for checking if cell is just
-            mutated. This helps to mark positions that are just mutated to make it clearer.
-
-            Args:
-                cells_mutated:
-                position:
-
-            Returns:
-                if cell has been mutated
-            """
-            if cells_mutated is None:
-                return False
-            return any([mutated.cell == position for mutated in cells_mutated])
-
-        mutation = self._history[len(self._history) - 1]
-        cell_mutations = None if mutation is None else mutation.cell_mutations
+        # flattened indices of the cells mutated by the last action, marked to make it clearer
+        mutation = self.last_mutation
+        mutated_cells: frozenset[int] = frozenset(
+            _cell_index(mutated.cell) for mutated in mutation.cell_mutations
+        ) if mutation else frozenset()
         dim = BOARD_N
-        output = ""
+        parts: list[str] = []
         for row in range(dim * 2 - 1):
-            output += "    " * abs((dim - 1) - row)
-            for col in range(dim - abs(row - (dim - 1))):
+            offset = abs((dim - 1) - row)
+            r_start, q_start = max((dim - 1) - row, 0), max(row - (dim - 1), 0)
+            parts.append(_RENDER_SPACING * offset)
+            for col in range(dim - offset):
                 # Map row, col to r, q
-                r = max((dim - 1) - row, 0) + col
-                q = max(row - (dim - 1), 0) + col
-                pos = HexPos(r, q)
-                if self._cell_occupied(pos):
-                    player, power = self._state[pos]
+                r = r_start + col
+                q = q_start + col
+                index = r * dim + q
+                if self._occupied >> index & 1:
+                    player, power = self._colors[index], self._powers[index]
                     color = "r" if player == PlayerColor.RED else "b"
                     text  = f"{color}{power}".center(4)
-                    output += apply_ansi(text, ansi_color=color, bold=use_unicode,
-                                         mutated=is_mutated(cell_mutations, pos)) \
-                        if use_color else text
+                    parts.append(apply_ansi(text, ansi_color=color, bold=use_unicode,
+                                            mutated=index in mutated_cells)
+                                 if use_color else text)
                 else:
-                    output += "[__]" if is_mutated(cell_mutations, pos) else " .. "
-                output += "    "
-            output += "\n"
-        return output
+                    parts.append(_RENDER_MUTATED if index in mutated_cells else _RENDER_EMPTY)
+                parts.append(_RENDER_SPACING)
+            parts.append("\n")
+        return "".join(parts)
+
+    @property
+    def last_mutation(self) -> BoardMutation | None:
+        """
+        The mutation of the last action played, built from the history on demand, or `None` if
+        no actions have been played.
+        """
+        if not self._history:
+            return None
+        count = self._history_lens[-1]
+        return BoardMutation(
+            self._history[-1],
+            cell_mutations=tuple(
+                CellMutation(
+                    _CELL_POSITIONS[index], CellState.of(color, power),
+                    CellState.of(self._colors[index], self._powers[index])
+                )
+                for index, color, power in zip(self._history_cells[-count:],
+                                               self._history_colors[-count:],
+                                               self._history_powers[-count:])
+            )
+        )
+
+    @property
+    def zobrist(self) -> int:
+        """
+        The Zobrist hash of the cells and the turn's color, maintained incrementally.
+        """
+        return self._hash
 
     @property
     def turn_count(self) -> int:
@@ -270,34 +485,40 @@ class Board:
         """
         True iff the game is over.
         """
-        if self.turn_count < 2:
-            return False
-        return any([
-            self.turn_count >= MAX_TURNS,
-            self._color_power(PlayerColor.RED)  == 0,
-            self._color_power(PlayerColor.BLUE) == 0
-        ])
+        return self._game_state()[0]
 
     @property
     def winner_color(self) -> PlayerColor | None:
         """
         The player (color) who won the game, or None if no player has won.
         """
-        if not self.game_over:
-            return None
+        return self._game_state()[1]
 
-        red_power  = self._color_power(PlayerColor.RED)
-        blue_power = self._color_power(PlayerColor.BLUE)
+    def _game_state(self) -> tuple[bool, PlayerColor | None]:
+        """
+        Check whether the game is over and who has won it, reading each player's total power
+        only once.
+
+        Returns:
+            * `True` if the game is over, `False` if otherwise
+            * the winner's color, or `None` if no player has won
+        """
+        turn_count = self.turn_count
+        if turn_count < 2:
+            return False, None
+        red_power, blue_power = self._color_powers()
+        if turn_count < MAX_TURNS and red_power != 0 and blue_power != 0:
+            return False, None
         if abs(red_power - blue_power) < WIN_POWER_DIFF:
-            return None
-        return (PlayerColor.RED, PlayerColor.BLUE)[red_power < blue_power]
+            return True, None
+        return True, (PlayerColor.RED, PlayerColor.BLUE)[red_power < blue_power]
 
     @property
     def _total_power(self) -> int:
         """
         The total power of all cells on the board.
         """
-        return sum(map(lambda cell: cell.power, self._state.values()))
+        return self._color_pows[0] + self._color_pows[1]
 
     def _player_cells(self, color: PlayerColor) -> list[CellState]:
         """
@@ -308,10 +529,10 @@ class Board:
         Returns:
             list of cells where the player occupies
         """
-        return list(filter(
-            lambda cell: cell.player == color,
-            self._state.values()
-        ))
+        return [
+            CellState.of(player, power) for player, power in zip(self._colors, self._powers)
+            if player == color
+        ]
 
     def _color_power(self, color: PlayerColor) -> int:
         """
@@ -322,7 +543,17 @@ class Board:
         Returns:
             their total power
         """
-        return sum(map(lambda cell: cell.power, self._player_cells(color)))
+        return self._color_pows[color]
+
+    def _color_powers(self) -> tuple[int, int]:
+        """
+        Get the total power of both players, which are maintained with every cell mutation.
+
+        Returns:
+            the total power of red, and the total power of blue
+        """
+        red_power, blue_power = self._color_pows
+        return red_power, blue_power
 
     def _cell_occupied(self, pos: HexPos) -> bool:
         """
@@ -333,7 +564,7 @@ class Board:
         Returns:
             `True` if occupied, `False` if not
         """
-        return self._state[pos].power > 0
+        return self._occupied >> _cell_index(pos) & 1 == 1
 
     def _validate_action_pos_input(self, pos: HexPos):
         """
@@ -357,42 +588,35 @@ class Board:
 
     def _validate_spawn_action_input(self, action: SpawnAction):
         """
-        Validate the spawn action input by checking its type (has to be of correct spawn
-        action type), and all of its information, including the cell has to be of correct
-        type as well.
+        Validate the spawn action input by checking all of its information, including the cell
+        has to be of correct type. The action itself is already known to be a spawn action.
 
         Args:
             action: the spawn action
         """
-        if type(action) != SpawnAction:
-            raise IllegalActionException(
-                f"Action '{action}' is not a SPAWN action.", self._turn_color)
         self._validate_action_pos_input(action.cell)
 
     def _validate_spread_action_input(self, action: SpreadAction):
         """
-        Validate the spread action input by checking its type (has to be of correct spread
-        action type), and all of its information, including cell and direction have to be
-        of correct type as well.
+        Validate the spread action input by checking all of its information, including cell and
+        direction have to be of correct type. The action itself is already known to be a spread
+        action.
 
         Args:
             action: the spread action
         """
-        if type(action) != SpreadAction:
-            raise IllegalActionException(
-                f"Action '{action}' is not a SPREAD action.", self._turn_color)
         self._validate_action_pos_input(action.cell)
         self._validate_action_dir_input(action.direction)
 
-    def _resolve_spawn_action(self, action: SpawnAction) -> BoardMutation:
+    def _resolve_spawn_action(self, action: SpawnAction) -> int:
         """
         Method to resolve the spawn action before applying on board. It checks whether the
-        spawn action is valid, and what mutations will be a result of such spawn action.
+        spawn action is valid, and which cell is to be spawned on.
 
         Args:
             action: the spawn action
         Returns:
-            the board mutation
+            the flattened index of the spawned cell
         """
         self._validate_spawn_action_input(action)
         cell = action.cell
@@ -405,50 +629,26 @@ class Board:
         if self._cell_occupied(cell):
             raise IllegalActionException(
                 f"Cell {cell} is occupied.", self._turn_color)
+        return _cell_index(cell)
 
-        # return the board mutation as a result of spawn action
-        return BoardMutation(
-            action,
-            cell_mutations={CellMutation(
-                cell, self._state[cell],
-                CellState(self._turn_color, 1)
-            )},
-        )
-
-    def _resolve_spread_action(self, action: SpreadAction) -> BoardMutation:
+    def _resolve_spread_action(self, action: SpreadAction) -> int:
         """
         Method to resolve the spread action before applying on board. It checks whether the
-        spread action is valid, and what mutations will be a result of such spread action.
+        spread action is valid, and which cell is to be spread from.
 
         Args:
             action: the spread action
         Returns:
-            the board mutation
+            the flattened index of the spread cell
         """
         self._validate_spread_action_input(action)
-        from_cell, dir = action.cell, action.direction
+        from_cell = action.cell
         action_player: PlayerColor = self._turn_color
 
         # confirm that the spread action is legal
-        if self[from_cell].player != action_player:
+        index = _cell_index(from_cell)
+        if self._colors[index] != action_player:
             raise IllegalActionException(
                 f"SPREAD cell {from_cell} not occupied by {action_player}",
                 self._turn_color)
-
-        # Compute destination cell coordinates.
-        to_cells = [
-            from_cell + dir * (i + 1) for i in range(self[from_cell].power)
-        ]
-
-        # return the board mutation as a result of the spread action
-        return BoardMutation(
-            action,
-            cell_mutations={
-               # Remove token stack from source cell.
-               CellMutation(from_cell, self[from_cell], CellState()),
-            } | {
-               # Add token stack to destination cells.
-               CellMutation(to_cell, self[to_cell], CellState(action_player, self[to_cell].power + 1)
-                            ) for to_cell in to_cells
-            }
-        )
+        return index
@@ -48,7 +48,7 @@ class HexVec:
         return self.__class__(self.r - other.r, self.q - other.q)
 
     def __neg__(self) -> 'HexVec':
-        return self.__class__(self.r * -1, self.q * -1)
+        return self.__class__(-self.r, -self.q)
 
     def __mul__(self, n: int) -> 'HexVec':
         return self.__class__(self.r * n, self.q * n)
@@ -78,37 +78,46 @@ class HexDir(Enum):
     Up        = HexVec(1, -1)
     UpRight   = HexVec(1, 0)
 
+    def __init__(self, vec: HexVec):
+        # the components are copied onto the member itself, so reading them is a plain attribute
+        # access rather than going through the enum value
+        self.r: int = vec.r
+        self.q: int = vec.q
+
     @classmethod
     def _missing_(cls, value: tuple[int, int]):
-        for item in cls:
-            if item.value == HexVec(*value):
-                return item
-        raise ValueError(f"Invalid hex direction: {value}")
+        direction = _VEC_DIRECTIONS.get(HexVec(*value))
+        if direction is None:
+            raise ValueError(f"Invalid hex direction: {value}")
+        return direction
 
     def __neg__(self) -> 'HexDir':
-        return HexDir(-self.value)
+        return _OPPOSITE_DIRECTIONS[self._name_]
 
     def __mul__(self, n: int) -> 'HexVec':
-        return self.value * n
+        return HexVec(self.r * n, self.q * n)
 
     def __str__(self) -> str:
-        return {
-            HexDir.DownRight: "[↘]",
-            HexDir.Down:      "[↓]",
-            HexDir.DownLeft:  "[↙]",
-            HexDir.UpLeft:    "[↖]",
-            HexDir.Up:        "[↑]",
-            HexDir.UpRight:   "[↗]"
-        }[self]
-
-    def __getattribute__(self, __name: str) -> int:
-        match __name:
-            case "r":
-                return self.value.r
-            case "q":
-                return self.value.q
-            case _:
-                return super().__getattribute__(__name)
+        return _DIRECTION_SYMBOLS[self._name_]
+
+
+# the symbol of each direction, by its member name
+_DIRECTION_SYMBOLS: dict[str, str] = {
+    "DownRight" : "[↘]",
+    "Down"      : "[↓]",
+    "DownLeft"  : "[↙]",
+    "UpLeft"    : "[↖]",
+    "Up"        : "[↑]",
+    "UpRight"   : "[↗]"
+}
+
+# the direction of each vector, for looking up a direction by a value that is not a member
+_VEC_DIRECTIONS: dict[HexVec, HexDir] = {direction.value: direction for direction in HexDir}
+
+# the opposite of each direction, by its member name
+_OPPOSITE_DIRECTIONS: dict[str, HexDir] = {
+    direction.name: _VEC_DIRECTIONS[-direction.value] for direction in HexDir
+}
 
 
 @dataclass(order=True, frozen=True)
@@ -132,13 +141,58 @@ class HexPos(HexVec):
         return f"{self.r}-{self.q}"
 
     def __add__(self, other: 'HexDir|HexVec') -> 'HexPos':
-        return self.__class__(
-            (self.r + other.r) % BOARD_N, 
-            (self.q + other.q) % BOARD_N,
-        )
+        # the wrapped coordinates are always within bounds, so the interned position is returned
+        # rather than constructing and bounds checking a new one
+        return _POSITIONS[((self.r + other.r) % BOARD_N) * BOARD_N + (self.q + other.q) % BOARD_N]
 
     def __sub__(self, other: 'HexDir|HexVec') -> 'HexPos':
-        return self.__class__(
-            (self.r - other.r) % BOARD_N, 
-            (self.q - other.q) % BOARD_N
-        )
+        return _POSITIONS[((self.r - other.r) % BOARD_N) * BOARD_N + (self.q - other.q) % BOARD_N]
+
+    @property
+    def index(self) -> int:
+        """
+        The index of the position within the flattened (row-major) board, from 0 to
+        ``BOARD_N * BOARD_N - 1``.
+        """
+        return self.r * BOARD_N + self.q
+
+    @classmethod
+    def from_index(cls, index: int) -> 'HexPos':
+        """
+        Get the interned position of an index within the flattened (row-major) board.
+
+        Args:
+            index: the flattened index
+        Returns:
+            the position
+        """
+        return _POSITIONS[index]
+
+    def neighbour(self, direction: HexDir, distance: int = 1) -> 'HexPos':
+        """
+        Get the position a given distance away towards a direction, wrapping around the board.
+        This is looked up from a precomputed table, rather than going through vector arithmetic.
+
+        Args:
+            direction : the direction
+            distance  : the number of steps towards the direction, default = 1
+        Returns:
+            the interned position reached
+        """
+        return _NEIGHBOURS[direction][self.r * BOARD_N + self.q][distance % BOARD_N]
+
+
+# every position of the board, in flattened (row-major) order
+_POSITIONS: tuple[HexPos, ...] = tuple(HexPos(r, q) for r in range(BOARD_N) for q in range(BOARD_N))
+
+# for each direction and each flattened position, the positions reached at every distance
+# from 0 to BOARD_N - 1, after which they wrap around
+_NEIGHBOURS: dict[HexDir, tuple[tuple[HexPos, ...], ...]] = {
+    direction: tuple(
+        tuple(_POSITIONS[((pos.r + direction.value.r * distance) % BOARD_N) * BOARD_N
+                         + (pos.q + direction.value.q * distance) % BOARD_N]
+              for distance in range(BOARD_N))
+        for pos in _POSITIONS
+    )
+    for direction in HexDir
+}
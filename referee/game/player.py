@@ -34,12 +34,9 @@ class PlayerColor(Enum):
 
     def __str__(self) -> str:
         """
-        String representation of a player colour identifier.
+        String representation of a player colour identifier, which is simply its member name.
         """
-        return {
-            PlayerColor.RED: "RED",
-            PlayerColor.BLUE: "BLUE"
-        }[self]
+        return self._name_
 
     def log_format(self, ansi=False) -> str:
         """
@@ -52,35 +49,37 @@ class PlayerColor(Enum):
         Returns:
             the ansi string format
         """
-        color = ""
-        width = ""
-        if ansi:
-            color = LogColor.RED if self.value == 0 else LogColor.BLUE
-            width = LogColor.BOLD
-        return f"{width}{color}{self.__str__()}{LogColor.RESET_ALL}"
+        return _LOG_FORMATS[self._value_][1 if ansi else 0]
 
     def __index__(self) -> int:
         """
         Return the index of the player (0 or 1).
         """
-        return self.value
+        return self._value_
 
     def __int__(self) -> int:
         """
         Player value in zero-sum form (+1 RED, -1 BLUE). 
         """
-        return 1 - 2 * self.value
+        return 1 - 2 * self._value_
 
     @property
     def opponent(self) -> "PlayerColor":
         """
-        Return the other player colour (there are only two!).
+        Return the other player colour (there are only two!), looked up by the player's index.
         """
-        match self:
-            case PlayerColor.RED:
-                return PlayerColor.BLUE
-            case PlayerColor.BLUE:
-                return PlayerColor.RED
+        return _OPPONENTS[self._value_]
+
+
+# the opponent of each player, indexed by the player's index
+_OPPONENTS: tuple[PlayerColor, PlayerColor] = (PlayerColor.BLUE, PlayerColor.RED)
+
+# the log format of each player, indexed by the player's index, then by whether ansi is applied
+_LOG_FORMATS: tuple[tuple[str, str], ...] = tuple(
+    (f"{color}{LogColor.RESET_ALL}",
+     f"{LogColor.BOLD}{LogColor.RED if color is PlayerColor.RED else LogColor.BLUE}{color}{LogColor.RESET_ALL}")
+    for color in PlayerColor
+)
 
 
 class Player:
@@ -88,6 +87,11 @@ class Player:
     Player is an abstract base class for actual players of the game.
     It's used internally by the referee to wrap your agent and/or other virtual players.
     """
+    __slots__ = [
+        "_color",
+        "_ansi"
+    ]
+
     def __init__(self, color: PlayerColor, ansi):
         """
         Player constructor. Modified by The Duy Nguyen (1100548) to add the option of
@@ -11,16 +11,18 @@ Notes:
     Various modifications were made to produce better logs, visually, by The Duy Nguyen (1100548).
 """
 
-from enum import Enum
+from enum import Enum, IntEnum
 from time import time
 from typing import Any, Callable
+from weakref import WeakSet
 
 
 # Define simple logging utility/helpers for the referee.
 
-class LogColor(Enum):
+class LogColor(str, Enum):
     """
-    Enumerated class representing the color of log string. Log colors are ansi-formatted.
+    Enumerated class representing the color of log string. Log colors are ansi-formatted, and
+    each color is itself its ansi-escape string.
     The following are the currently available colors.
     Attributes:
         RED       :
@@ -45,14 +47,14 @@ class LogColor(Enum):
     BOLD      = "\033[1m"
     RESET_ALL = "\033[0m"
 
-    def __str__(self):
-        return self.value
+    # the member is already its own string, so it is converted without going through its value
+    __str__ = str.__str__
 
     def __value__(self):
         return self.value
 
 
-class LogLevel(Enum):
+class LogLevel(IntEnum):
     """
     Log level class representing the type of log. The log can either be:
         <li>DEBUG   : debug mode log
@@ -67,29 +69,39 @@ class LogLevel(Enum):
     ERROR    = 3
     CRITICAL = 4
 
-    def __int__(self):
-        return self.value
-
-    def __lt__(self, other):
-        return int(self) < int(other)
-
-    def __le__(self, other):
-        return int(self) <= int(other)
 
-    def __gt__(self, other):
-        return int(self) > int(other)
-
-    def __ge__(self, other):
-        return int(self) >= int(other)
+# the symbol of each log level, indexed by the level
+_LEVEL_SYMBOLS: tuple[str, ...] = ("~ ", ": ", "# ", "! ", "@ ")
 
 
 class LogStream:
     """
     Log stream which represents a stream of actual log. It is the class responsible for
-    displaying and handling log's logic.
+    displaying and handling log's logic. Each setting of a stream is resolved into its own
+    attribute, from the stream's overrides or otherwise the global settings, and resolved again
+    whenever a global setting changes.
     """
+    __slots__ = [
+        "_namespace",
+        "_overrides",
+        "_color",
+        "_level",
+        "_handlers",
+        "_unicode",
+        "_ansi",
+        "_output_time",
+        "_output_namespace",
+        "_output_level",
+        "_enabled_debug",
+        "_enabled_info",
+        "_enabled_warning",
+        "_enabled_error",
+        "_prefix_namespace",
+        "__weakref__"
+    ]
     _start_time = None
     _max_namespace_length = 0
+    _streams: 'WeakSet[LogStream]' = WeakSet()
     _global_settings = {
         "level"            : LogLevel.DEBUG,
         "handlers"         : [print],
@@ -116,31 +128,31 @@ class LogStream:
         Log stream constructor.
         """
         self._namespace = namespace
-        if color is not None:
-            self._color = color
-        if level is not None:
-            self._level = level
-        if handlers is not None:
-            self._handlers = handlers
-        if unicode is not None:
-            self._unicode = unicode
-        if ansi is not None:
-            self._ansi = ansi
-        if output_time is not None:
-            self._output_time = output_time
-        if output_namespace is not None:
-            self._output_namespace = output_namespace
-        if output_level is not None:
-            self._output_level = output_level
+        overrides = {
+            "color"            : color,
+            "level"            : level,
+            "handlers"         : handlers,
+            "unicode"          : unicode,
+            "ansi"             : ansi,
+            "output_time"      : output_time,
+            "output_namespace" : output_namespace,
+            "output_level"     : output_level,
+        }
+        self._overrides: dict[str, Any] = {
+            key: value for key, value in overrides.items() if value is not None
+        }
 
         # Consistent start time for all log streams
         LogStream._start_time = LogStream._start_time or time()
 
-        # Consistent namespace length for all log streams
-        LogStream._max_namespace_length = max(
-            LogStream._max_namespace_length,
-            len(self._namespace)
-        )
+        # Consistent namespace length for all log streams, where every existing stream's namespace
+        # is padded again if this stream's namespace is the longest
+        if len(self._namespace) > LogStream._max_namespace_length:
+            LogStream._max_namespace_length = len(self._namespace)
+            for stream in LogStream._streams:
+                stream._resolve_settings()
+        self._resolve_settings()
+        LogStream._streams.add(self)
 
     @classmethod
     def set_global_setting(cls, key: str, value: Any):
@@ -152,6 +164,48 @@ class LogStream:
             value : its value to be set to
         """
         cls._global_settings[key] = value
+        for stream in cls._streams:
+            stream._resolve_settings()
+
+    def _resolve_settings(self):
+        """
+        Resolve every setting of the stream into its own attribute, taking the stream's override
+        if there is one, and the global setting otherwise.
+        """
+        settings = LogStream._global_settings | self._overrides
+        self._color            : LogColor       = settings["color"]
+        self._level            : LogLevel       = settings["level"]
+        self._handlers         : list[Callable] = settings["handlers"]
+        self._unicode          : bool           = settings["unicode"]
+        self._ansi             : bool           = settings["ansi"]
+        self._output_time      : bool           = settings["output_time"]
+        self._output_namespace : bool           = settings["output_namespace"]
+        self._output_level     : bool           = settings["output_level"]
+
+        # whether each level is logged, so that a disabled log returns before any formatting
+        self._enabled_debug    : bool = self._level <= LogLevel.DEBUG
+        self._enabled_info     : bool = self._level <= LogLevel.INFO
+        self._enabled_warning  : bool = self._level <= LogLevel.WARNING
+        self._enabled_error    : bool = self._level <= LogLevel.ERROR
+
+        # the namespace is padded to the longest namespace of all streams
+        self._prefix_namespace : str = \
+            f"* {self._namespace:<{LogStream._max_namespace_length}} " if self._output_namespace else ""
+
+    @property
+    def debug_enabled(self) -> bool:
+        """
+        Whether debug logs of the stream are output, so a caller can skip building a debug message.
+        """
+        return self._enabled_debug
+
+    @property
+    def info_enabled(self) -> bool:
+        """
+        Whether information logs of the stream are output, so a caller can skip building an
+        information message.
+        """
+        return self._enabled_info
 
     def setting(self, key: str) -> Any:
         """
@@ -164,7 +218,7 @@ class LogStream:
             if existed, return the local settings,
             otherwise return global settings
         """
-        return getattr(self, f"_{key}", LogStream._global_settings[key])
+        return getattr(self, f"_{key}")
 
     def log(self, message: str, level: LogLevel = LogLevel.INFO):
         """
@@ -174,16 +228,11 @@ class LogStream:
             message : specified log message
             level   : log's type
         """
-        message_lines = message.splitlines()
-        for line in message_lines:
-            self._out(
-                f"{self._s_color_start()}"
-                f"{self._s_namespace()}"
-                f"{self._s_time()}"
-                f"{self._s_level(level)}"
-                f"{self._s_color_end()}"
-                f"{line}"
-            )
+        # the prefix around the time is the same for every line, so it is only assembled once
+        start = f"{self._s_color_start()}{self._s_namespace()}"
+        end   = f"{self._s_level(level)}{self._s_color_end()}"
+        for line in message.splitlines():
+            self._out(f"{start}{self._s_time() if self._output_time else ''}{end}{line}")
 
     def _out(self, message: str):
         """
@@ -191,61 +240,66 @@ class LogStream:
         Args:
             message: specified message
         """
-        # Optionally strip unicode symbols
-        if not self.setting("unicode"):
+        # Optionally strip unicode symbols, which a message of only ascii characters does not have
+        if not self._unicode and not message.isascii():
             message = message.encode("ascii", "ignore").decode()
-        for handler in self.setting("handlers"):
+        for handler in self._handlers:
             handler(message)
 
-    def debug(self, message=""):
+    def debug(self, message="", *args):
         """
-        Debug log.
+        Debug log. The message is only formatted with its arguments if the log is enabled.
         Args:
-            message: the debug message
+            message : the debug message, as a `%`-style format if given arguments
+            args    : the arguments to format the message with
         """
-        if self.setting("level") <= LogLevel.DEBUG:
-            self.log(message, LogLevel.DEBUG)
+        if self._enabled_debug:
+            self.log(message % args if args else message, LogLevel.DEBUG)
 
-    def info(self, message="\n"):
+    def info(self, message="\n", *args):
         """
-        Information log.
+        Information log. The message is only formatted with its arguments if the log is enabled.
         Args:
-            message: the information message
+            message : the information message, as a `%`-style format if given arguments
+            args    : the arguments to format the message with
         """
-        if self.setting("level") <= LogLevel.INFO:
-            self.log(message, LogLevel.INFO)
+        if self._enabled_info:
+            self.log(message % args if args else message, LogLevel.INFO)
 
-    def warning(self, message=""):
+    def warning(self, message="", *args):
         """
-        Warning log.
+        Warning log. The message is only formatted with its arguments if the log is enabled.
         Args:
-            message: the warning message
+            message : the warning message, as a `%`-style format if given arguments
+            args    : the arguments to format the message with
         """
-        if self.setting("level") <= LogLevel.WARNING:
-            self.log(message, LogLevel.WARNING)
+        if self._enabled_warning:
+            self.log(message % args if args else message, LogLevel.WARNING)
 
-    def error(self, message=""):
+    def error(self, message="", *args):
         """
-        Error log.
+        Error log. The message is only formatted with its arguments if the log is enabled.
         Args:
-            message: the error message
+            message : the error message, as a `%`-style format if given arguments
+            args    : the arguments to format the message with
         """
-        if self.setting("level") <= LogLevel.ERROR:
-            self.log(message, LogLevel.ERROR)
+        if self._enabled_error:
+            self.log(message % args if args else message, LogLevel.ERROR)
 
-    def critical(self, message=""):
+    def critical(self, message="", *args):
         """
         Critical log. Note that we always print critical messages.
         Args:
-            message: the critical message
+            message : the critical message, as a `%`-style format if given arguments
+            args    : the arguments to format the message with
         """
-        self.log(message, LogLevel.CRITICAL)
+        self.log(message % args if args else message, LogLevel.CRITICAL)
 
     def _s_time(self) -> str:
         """
         Get the current time (wrt starting the game).
         """
-        if not self.setting("output_time"):
+        if not self._output_time:
             return ""
         update_time = time() - (LogStream._start_time or 0)
         return f"T{update_time:06.2f} "
@@ -254,9 +308,7 @@ class LogStream:
         """
         Get the current namespace.
         """
-        if not self.setting("output_namespace"):
-            return ""
-        return f"* {self._namespace:<{LogStream._max_namespace_length}} "
+        return self._prefix_namespace
 
     def _s_level(self, level=LogLevel.INFO) -> str:
         """
@@ -267,30 +319,24 @@ class LogStream:
         Returns:
             encoded string for corresponding log level
         """
-        if not self.setting("output_level"):
+        if not self._output_level:
             return ""
-        return {
-            LogLevel.DEBUG    : "~",
-            LogLevel.INFO     : ":",
-            LogLevel.WARNING  : "#",
-            LogLevel.ERROR    : "!",
-            LogLevel.CRITICAL : "@"
-        }[level] + " "
+        return _LEVEL_SYMBOLS[level]
 
     def _s_color_start(self) -> str:
         """
         Get the color of the start player (maybe I really don't know actually, there
         were minimal documentations).
         """
-        if not self.setting("ansi"):
+        if not self._ansi:
             return ""
-        return f"{self.setting('color')}"
+        return f"{self._color}"
 
     def _s_color_end(self) -> str:
         """
         Get the color of end player (??).
         """
-        if not self.setting("ansi"):
+        if not self._ansi:
             return ""
         return f"{LogColor.RESET_ALL}"
 
@@ -299,6 +345,8 @@ class NullLogger(LogStream):
     """
     Null logger class represents a log that does not do anything.
     """
+    __slots__ = []
+
     def __init__(self):
         super().__init__("null", None, LogLevel.ERROR)
 
@@ -22,11 +22,11 @@ import asyncio
 from argparse import Namespace
 from pathlib import Path
 from traceback import format_tb
+from typing import TextIO
 
 from .game import Player, PlayerColor
 from .log import LogStream, LogColor, LogLevel
-from .run import game_user_wait, run_game, game_commentator, \
-                 game_event_logger, game_delay, output_board_updates
+from .run import run_game, game_commentator, game_event_logger, board_update_sink
 from .agent import AgentProxyPlayer
 from .options import get_options
 
@@ -62,6 +62,7 @@ def main(options: Namespace | None = None):
     # Game log stream
     gl: LogStream | None = None
     gl_path: Path | None = None
+    gl_file: TextIO | None = None
 
     if options.logfile is not None:
         if options.logfile == 'stdout':
@@ -80,15 +81,17 @@ def main(options: Namespace | None = None):
                 rl.debug(f"clearing existing log file '{options.logfile}'")
                 gl_path.unlink()
 
+            # the file is opened once and written through its buffer, then closed when the game ends
+            gl_file = open(gl_path, "a")
+            gl_write = gl_file.write
+
             def game_log_handler(message: str):
                 """
                 Helper function to handle game logs.
                 Args:
                     message: the log
                 """
-                if gl_path is not None:
-                    with open(gl_path, "a") as f:
-                        f.write(message + "\n")
+                gl_write(message + "\n")
 
             # File game log stream
             gl = LogStream(
@@ -127,9 +130,14 @@ def main(options: Namespace | None = None):
             event_handlers = [
                 game_event_logger(gl) if gl is not None else None,
                 game_commentator(rl),
-                output_board_updates(rl, ops.use_colour, ops.use_unicode) if ops.verbosity >= 2 else None,
-                game_delay(ops.wait) if ops.wait > 0 else None,
-                game_user_wait(rl) if ops.wait < 0 else None,
+                board_update_sink(
+                    rl,
+                    output_board   = ops.verbosity >= 2,
+                    delay          = ops.wait,
+                    wait_for_input = ops.wait < 0,
+                    use_color      = ops.use_colour,
+                    use_unicode    = ops.use_unicode,
+                ) if ops.verbosity >= 2 or ops.wait != 0 else None,
             ]
 
             return await run_game(
@@ -148,6 +156,9 @@ def main(options: Namespace | None = None):
         rl.info()  # (end the line)
         rl.info("KeyboardInterrupt: bye!")
         rl.critical("result: <interrupt>")
+        # the process is killed without unwinding, so the buffered game log is written out first
+        if gl_file is not None:
+            gl_file.flush()
         os.kill(os.getpid(), 9)
 
     # Exception handling - where an issue appeared in a specific thread
@@ -162,3 +173,7 @@ def main(options: Namespace | None = None):
             f">> the trigger and the above stack trace.")
         rl.critical(f"result: <error>")
         exit(1)
+
+    finally:
+        if gl_file is not None:
+            gl_file.close()
@@ -12,28 +12,66 @@ Notes:
     lost the game. Package parser is heavily modified by The Duy Nguyen (1100548).
 """
 
+import re
 import sys
 import argparse
-from .game import PlayerColor, TITLE_SCREEN, GAME_NAME, NUM_PLAYERS
+from functools import lru_cache
+from typing import Any, Callable
 
 # Program information:
 PROGRAM = "referee"
 VERSION = "2023.0.1"
-DESCRIPTION = (
-    f"Conduct a game of {GAME_NAME} between {NUM_PLAYERS} Agent classes."
-)
 F_WIDTH = 79
 
 
-WELCOME = f"""
+@lru_cache(maxsize=1)
+def _description() -> str:
+    """
+    Get the description of the program, formatted from the game's information on first use.
+    """
+    from .game import GAME_NAME, NUM_PLAYERS
+    return f"Conduct a game of {GAME_NAME} between {NUM_PLAYERS} Agent classes."
+
+
+@lru_cache(maxsize=1)
+def _welcome() -> str:
+    """
+    Get the welcome banner of the program, formatted on first use, since it is only printed when
+    there is any output.
+    """
+    from .game import TITLE_SCREEN
+    return f"""
 {'':*^{F_WIDTH}}
 {TITLE_SCREEN}
-{DESCRIPTION}
+{_description()}
 Run `python -m referee --help` for additional usage information.
 
 {'':*^{F_WIDTH}}"""
 
 
+# the constants formatted on first access, by the function formatting each
+_LAZY_CONSTANTS: dict[str, Callable[[], str]] = {
+    "DESCRIPTION" : _description,
+    "WELCOME"     : _welcome,
+}
+
+
+def __getattr__(name: str) -> str:
+    """
+    Get a constant of the module that is only formatted on first access, which is then kept as an
+    ordinary attribute of the module.
+
+    Args:
+        name: the name of the constant
+    Returns:
+        the formatted constant
+    """
+    format_constant = _LAZY_CONSTANTS.get(name)
+    if format_constant is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = format_constant()
+    return value
+
 # default values (to use if flag is not provided) and missing values
 # (to use if flag is provided, but with no value)
 
@@ -71,46 +109,18 @@ symbol ':' (e.g. 'agent:DifferentAgent').
 """
 
 
-def get_options():
-    """
-    Parse and return command-line arguments.
-    """
-
-    parser = argparse.ArgumentParser(
-        prog            = PROGRAM,
-        description     = DESCRIPTION,
-        add_help        = False,        # <-- we will add it back to the optional group.
-        formatter_class = argparse.RawDescriptionHelpFormatter,
-    )
-
-    # positional arguments used for player agent package specifications:
-    positionals = parser.add_argument_group(
-        title       = "Basic usage",
-        description = PKG_SPEC_HELP,
-    )
-    for num, col in enumerate(map(str, PlayerColor), 1):
-        positionals.add_argument(
-            f"player{num}_loc",
-            metavar = col,
-            action  = PackageSpecAction,
-            help    = f"location of {col.title()}'s player Agent class (e.g. package name)",
-        )
-
-    # optional arguments used for configuration:
-    optionals = parser.add_argument_group(title="Optional arguments")
-    optionals.add_argument(
-        "-h"    , "--help",
+# the optional arguments, each as its flags and the keyword arguments to add it with, grouped by
+# entry where the arguments of an entry with more than one argument are mutually exclusive
+_OPTIONAL_ARGUMENTS: tuple[tuple[tuple[tuple[str, ...], dict[str, Any]], ...], ...] = (
+    ((("-h", "--help"), dict(
         action  = "help",
         help    = "show this message.",
-    )
-    optionals.add_argument(
-        "-V"    , "--version",
+    )),),
+    ((("-V", "--version"), dict(
         action  = "version",
         version = VERSION,
-    )
-
-    optionals.add_argument(
-        "-w"    , "--wait",
+    )),),
+    ((("-w", "--wait"), dict(
         metavar = "wait",
         type    = float,
         nargs   = "?",
@@ -118,35 +128,28 @@ def get_options():
         const   = WAIT_NO_VALUE,   # if the flag is present with no value
         help    = "how long (float, seconds) to wait between game turns. 0: "
                   "no delay; negative: wait for user input.",
-    )
-
-    optionals.add_argument(
-        "-s"    , "--space",
+    )),),
+    ((("-s", "--space"), dict(
         metavar = "space_limit",
         type    = float,
         nargs   = "?",
         default = SPACE_LIMIT_DEFAULT,
         const   = SPACE_LIMIT_NO_VALUE,
         help    = "limit on memory space (float, MB) for each agent.",
-    )
-    optionals.add_argument(
-        "-t"    , "--time",
+    )),),
+    ((("-t", "--time"), dict(
         metavar = "time_limit",
         type    = float,
         nargs   = "?",
         default = TIME_LIMIT_DEFAULT,
         const   = TIME_LIMIT_NO_VALUE,
         help    = "limit on CPU time (float, seconds) for each agent.",
-    )
-
-    verbosity_group = optionals.add_mutually_exclusive_group()
-    verbosity_group.add_argument(
-        "-d"    , "--debug",
+    )),),
+    ((("-d", "--debug"), dict(
         action  = "store_true",
         help    = "show extra debug level logs (equivalent to -v 3)",
-    )
-    verbosity_group.add_argument(
-        "-v"    , "--verbosity",
+    )),
+     (("-v", "--verbosity"), dict(
         type    = int,
         choices = range(0, VERBOSITY_LEVELS),
         nargs   = "?",
@@ -156,10 +159,8 @@ def get_options():
                   "agents). 0: no output except result; 1: commentary, but no"
                   " board display; 2: (default) commentary and board display; "
                   "3: (equivalent to -d) extra debug information.",
-    )
-
-    optionals.add_argument(
-        "-l"    , "--logfile",
+    ))),
+    ((("-l", "--logfile"), dict(
         type    = str,
         nargs   = "?",
         default = LOGFILE_DEFAULT,
@@ -168,35 +169,38 @@ def get_options():
         help    = "if you supply this flag the referee will redirect the log of "
                   "all game actions to a text file named %(metavar)s "
                   "(default: %(const)s).",
-    )
-
-    colour_group = optionals.add_mutually_exclusive_group()
-    colour_group.add_argument(
-        "-c"    , "--colour",
+    )),),
+    ((("-c", "--colour"), dict(
         action  = "store_true",
         help    = "force colour display using ANSI control sequences "
                   "(default behaviour is automatic based on system).",
-    )
-    colour_group.add_argument(
-        "-C"    , "--colourless",
+    )),
+     (("-C", "--colourless"), dict(
         action  = "store_true",
         help    = "force NO colour display (see -c).",
-    )
-
-    unicode_group = optionals.add_mutually_exclusive_group()
-    unicode_group.add_argument(
-        "-u"    , "--unicode",
+    ))),
+    ((("-u", "--unicode"), dict(
         action  = "store_true",
         help    = "force pretty display using unicode characters "
                   "(default behaviour is automatic based on system).",
-    )
-    unicode_group.add_argument(
-        "-a"    , "--ascii",
+    )),
+     (("-a", "--ascii"), dict(
         action  = "store_true",
         help    = "force basic display using only ASCII characters (see -u).",
-    )
+    ))),
+)
+
+
+def get_options():
+    """
+    Parse and return command-line arguments. The common forms of arguments are parsed directly,
+    and any other arguments (including help, version and invalid arguments) are parsed by
+    ``argparse``, which also reports their errors.
+    """
+    args = _fast_parse(sys.argv[1:])
+    if args is None:
+        args = _build_parser().parse_args()
 
-    args = parser.parse_args()
     # post-processing to combine mutually exclusive options
     # debug => verbosity 3
     if args.debug:
@@ -219,20 +223,176 @@ def get_options():
         args.use_unicode = False
     else:
         # quick and dirty check for unicode support as default
-        try:
-            '☺'.encode(sys.stdout.encoding)
-            auto_use_unicode = True
-        except UnicodeEncodeError:
-            auto_use_unicode = False
-        args.use_unicode = auto_use_unicode
+        args.use_unicode = _supports_unicode(sys.stdout.encoding)
     del args.unicode, args.ascii  # type: ignore
 
     # done!
     if args.verbosity > 0:
-        print(WELCOME)
+        print(_welcome())
+    return args
+
+
+@lru_cache
+def _supports_unicode(encoding: str | None) -> bool:
+    """
+    Check whether an output encoding can encode unicode symbols, where any utf encoding can, and any
+    other encoding is checked once by encoding a symbol with it.
+
+    Args:
+        encoding: the output encoding, or `None` if it is unknown
+    Returns:
+        `True` if the encoding can encode unicode symbols, `False` if otherwise
+    """
+    if not encoding:
+        return False
+    if encoding.lower().replace("-", "").startswith("utf"):
+        return True
+    try:
+        '☺'.encode(encoding)
+        return True
+    except (UnicodeEncodeError, LookupError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser of the program. Parsing does not change the parser, so it is only
+    built once and reused by any later call.
+    Returns:
+        the argument parser
+    """
+    from .game import PlayerColor
+
+    parser = argparse.ArgumentParser(
+        prog            = PROGRAM,
+        description     = _description(),
+        add_help        = False,        # <-- we will add it back to the optional group.
+        formatter_class = argparse.RawDescriptionHelpFormatter,
+    )
+
+    # positional arguments used for player agent package specifications:
+    positionals = parser.add_argument_group(
+        title       = "Basic usage",
+        description = PKG_SPEC_HELP,
+    )
+    for num, col in enumerate(map(str, PlayerColor), 1):
+        positionals.add_argument(
+            f"player{num}_loc",
+            metavar = col,
+            action  = PackageSpecAction,
+            help    = f"location of {col.title()}'s player Agent class (e.g. package name)",
+        )
+
+    # optional arguments used for configuration, where arguments sharing an entry are
+    # mutually exclusive
+    optionals = parser.add_argument_group(title="Optional arguments")
+    for arguments in _OPTIONAL_ARGUMENTS:
+        group = optionals if len(arguments) == 1 else optionals.add_mutually_exclusive_group()
+        for flags, kwargs in arguments:
+            group.add_argument(*flags, **kwargs)
+    return parser
+
+
+def _fast_parse(argv: list[str]) -> argparse.Namespace | None:
+    """
+    Parse the common forms of command-line arguments directly, without building the argument
+    parser. These are the two package specifications, and optional arguments each given as a
+    separate flag followed by its value, if any. Arguments are parsed the same way as they are by
+    the argument parser.
+
+    Args:
+        argv: the command-line arguments, excluding the program
+    Returns:
+        the parsed arguments, or `None` if any argument is not of a common form or is invalid
+    """
+    from .game import NUM_PLAYERS
+
+    args = argparse.Namespace(**_FAST_DEFAULTS)
+    locs = iter([f"player{num}_loc" for num in range(1, NUM_PLAYERS + 1)])
+    seen = set()
+    index, size = 0, len(argv)
+    while index < size:
+        token  = argv[index]
+        index += 1
+
+        # package specification
+        if not token.startswith("-"):
+            dest = next(locs, None)
+            if dest is None:
+                return None
+            try:
+                PackageSpecAction([], dest)(None, args, token)
+            except argparse.ArgumentError:
+                return None
+            continue
+
+        # optional argument, given as a separate flag
+        option = _FAST_OPTIONS.get(token)
+        if option is None:
+            return None
+        dest, kwargs = option
+        if kwargs.get("action") == "store_true":
+            value = True
+        elif index < size and (not argv[index].startswith("-") or _NEGATIVE_NUMBER.match(argv[index])):
+            try:
+                value  = kwargs["type"](argv[index])
+            except ValueError:
+                return None
+            index += 1
+            if "choices" in kwargs and value not in kwargs["choices"]:
+                return None
+        else:
+            value = kwargs["const"]
+        setattr(args, dest, value)
+        seen.add(dest)
+
+    # every package specification is required, and mutually exclusive arguments cannot both be given
+    if next(locs, None) is not None or any(len(seen & group) > 1 for group in _FAST_EXCLUSIVE):
+        return None
     return args
 
 
+# the separators between the directories of a package specification
+_PATH_SEPARATORS = re.compile(r"[/\\.]")
+
+# the agent class of each abbreviation matched exactly, and of each abbreviation contained within
+# the specification, where longer abbreviations come first so they are not matched by a shorter one
+_ABBR_EXACT: dict[str, str] = {"a": "Agent"}
+_ABBR_SUBSTR: tuple[tuple[str, str], ...] = (
+    ("mc", "MonteCarloAgent"),
+    ("ms", "MinimaxShallowAgent"),
+    ("ng", "NegaScoutAgent"),
+    ("ns", "NegaScoutAgent"),
+    ("r" , "RandomAgent"),
+    ("g" , "GreedyAgent"),
+)
+
+# a negative number, which is taken as a value rather than as a flag
+_NEGATIVE_NUMBER = re.compile(r"^-\d+$|^-\d*\.\d+$")
+
+# the destination and keyword arguments of each optional argument by its flags, other than help and
+# version, which are left to the argument parser
+_FAST_OPTIONS: dict[str, tuple[str, dict[str, Any]]] = {
+    flag: (flags[-1].lstrip("-"), kwargs)
+    for arguments in _OPTIONAL_ARGUMENTS
+    for flags, kwargs in arguments
+    if kwargs.get("action") not in ("help", "version")
+    for flag in flags
+}
+
+# the default value of each optional argument
+_FAST_DEFAULTS: dict[str, Any] = {
+    dest: kwargs.get("default", False) for dest, kwargs in _FAST_OPTIONS.values()
+}
+
+# the destinations of each group of mutually exclusive arguments
+_FAST_EXCLUSIVE: tuple[set[str], ...] = tuple(
+    {flags[-1].lstrip("-") for flags, _ in arguments}
+    for arguments in _OPTIONAL_ARGUMENTS if len(arguments) > 1
+)
+
+
 class PackageSpecAction(argparse.Action):
     """
     Class to parse the package and module to find the corresponding agent.
@@ -265,15 +425,7 @@ class PackageSpecAction(argparse.Action):
             )
 
         # clean up the directory
-        dirs: list[str]
-        if '/' in values:
-            dirs = values.split('/')
-        elif '\\' in values:
-            dirs = values.split('\\')
-        elif '.' in values:
-            dirs = values.split('.')
-        else:
-            dirs = [values]
+        dirs: list[str] = _PATH_SEPARATORS.split(values)
 
         cls = None
         potential_abbr = False
@@ -299,24 +451,13 @@ class PackageSpecAction(argparse.Action):
         # otherwise, the user must fully specify the entire directory
         else:
             pkg = dirs[0]
-            for dir in dirs[1:]:
-                cls += "." + dir
+            cls = ".".join(dirs[1:])
 
         # abbreviations
         if potential_abbr:
             cls_lower = cls.lower()
-            if cls_lower == "a":
-                cls = "Agent"
-            elif "r" in cls_lower:
-                cls = "RandomAgent"
-            elif "g" in cls_lower:
-                cls = "GreedyAgent"
-            elif "mc" in cls_lower:
-                cls = "MonteCarloAgent"
-            elif "ms" in cls_lower:
-                cls = "MinimaxShallowAgent"
-            elif "ng" in cls_lower or "ns" in cls_lower:
-                cls = "NegaScoutAgent"
+            cls = _ABBR_EXACT.get(cls_lower) or \
+                next((name for abbr, name in _ABBR_SUBSTR if abbr in cls_lower), cls)
 
         # convert path to module name
         mod = pkg
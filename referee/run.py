@@ -12,14 +12,19 @@ Notes:
 """
 
 import asyncio
-from time import time
-from typing import AsyncGenerator
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import AsyncGenerator, Callable
 
 from .log import LogStream
-from .game import Player, game, \
+from .game import Board, Player, game, \
     GameUpdate, PlayerInitialising, GameBegin, TurnBegin, TurnEnd, \
     BoardUpdate, PlayerError, GameEnd, UnhandledError
 
+# the executor waiting for user input, with its own thread so the wait is never queued behind
+# other work of the default executor
+_INPUT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="referee-input")
+
 
 async def run_game(players: list[Player],
                    event_handlers: list[AsyncGenerator | None]
@@ -34,21 +39,6 @@ async def run_game(players: list[Player],
     Returns:
         the winning player (interface) or 'None' if drawn.
     """
-
-    async def _update_handlers(handlers: list[AsyncGenerator | None], updates: GameUpdate | None):
-        """
-        Helper function to handle the update.
-        Args:
-            handlers : the handlers
-            updates  : specified update
-        """
-        for handler in handlers:
-            try:
-                if handler is not None:
-                    await handler.asend(updates)
-            except StopAsyncIteration:
-                handlers.remove(handler)
-
     await _update_handlers(event_handlers, None)
     async for update in game(*players):
         await _update_handlers(event_handlers, update)
@@ -57,6 +47,23 @@ async def run_game(players: list[Player],
                 return winner
 
 
+async def _update_handlers(handlers: list[AsyncGenerator | None], updates: GameUpdate | None):
+    """
+    Helper function to handle the update. A handler that has finished is replaced by `None` in
+    place, rather than being removed from the handlers while they are iterated over.
+    Args:
+        handlers : the handlers
+        updates  : specified update
+    """
+    for index, handler in enumerate(handlers):
+        if handler is None:
+            continue
+        try:
+            await handler.asend(updates)
+        except StopAsyncIteration:
+            handlers[index] = None
+
+
 async def game_commentator(stream: LogStream) -> AsyncGenerator:
     """
     Intercepts game updates and provides some simple commentary.
@@ -96,6 +103,21 @@ async def game_commentator(stream: LogStream) -> AsyncGenerator:
                 stream.error(f"fatal error: {message}")
 
 
+# the logging of each type of game update by the event logger, given the update and the functions
+# logging an event of a player and of the referee, looked up by the exact type of the update
+_LOGGER_DISPATCH: dict[type, Callable[[GameUpdate, Callable, Callable], None]] = {
+    PlayerInitialising : lambda u, log_player, log_referee: log_player(u.player, "initialising"),
+    GameBegin          : lambda u, log_player, log_referee: log_referee("game_begin"),
+    TurnBegin          : lambda u, log_player, log_referee: log_player(u.player, "turn_begin", f"{u.turn_id}"),
+    TurnEnd            : lambda u, log_player, log_referee:
+                             log_player(u.player, "turn_end", f"{u.turn_id}", str(u.action)),
+    BoardUpdate        : lambda u, log_player, log_referee: log_referee("board_update"),
+    GameEnd            : lambda u, log_player, log_referee: log_referee("game_end", f"winner:{u.winner}"),
+    PlayerError        : lambda u, log_player, log_referee: log_referee("player_error", u.message),
+    UnhandledError     : lambda u, log_player, log_referee: log_referee("unhandled_error", u.message),
+}
+
+
 async def game_event_logger(stream: LogStream) -> AsyncGenerator:
     """
     Intercepts all game events and logs them in a parseable format.
@@ -105,7 +127,7 @@ async def game_event_logger(stream: LogStream) -> AsyncGenerator:
     .. math:: <time>\t<actor>\t<event>[\t<param_k>]*
 
     Where:
-        - <time>     is the wall clock time since the game started (seconds).
+        - <time>     is the time since the game started (seconds), from a monotonic clock.
         - <actor>    is either "referee" or the player colour.
         - <event>    is the event name.
         - <param_k>  k'th event argument (if applicable).
@@ -116,40 +138,33 @@ async def game_event_logger(stream: LogStream) -> AsyncGenerator:
     Returns:
         asynchronous interception
     """
-    start_time = time()
+    start_time = perf_counter()
 
     def _log(*params: str):
-        update_time = time() - start_time
-        stream.info(f"T{update_time:08.3f}\t" + "\t".join(params))
+        # formatted by the stream, and only if the line is logged
+        stream.info("T%08.3f\t%s", perf_counter() - start_time, "\t".join(params))
 
     def log_referee(*params: str):
         _log("referee", *params)
 
+    # the string of each player, which does not change over the game
+    player_names: dict[Player, str] = {}
+
     def log_player(p: Player, *params: str):
-        _log(str(p), *params)
+        name = player_names.get(p)
+        if name is None:
+            name = player_names[p] = str(p)
+        _log(name, *params)
 
     while True:
         update: GameUpdate = yield
-        match update:
-            case PlayerInitialising(player):
-                log_player(player, "initialising")
-            case GameBegin(_):
-                log_referee("game_begin")
-            case TurnBegin(turn_id, player):
-                log_player(player, "turn_begin", f"{turn_id}")
-            case TurnEnd(turn_id, player, action):
-                log_player(player, "turn_end", f"{turn_id}", str(action))
-            case BoardUpdate(_):
-                log_referee("board_update")
-            case GameEnd(win_player_id):
-                log_referee("game_end", f"winner:{win_player_id}")
-            case PlayerError(message):
-                log_referee("player_error", message)
-            case UnhandledError(message):
-                log_referee("unhandled_error", message)
-            case _:
-                # Logger is expected to handle all game updates.
-                raise NotImplementedError(f"unhandled game update: {update}")
+        if not stream.info_enabled:
+            continue
+        handler = _LOGGER_DISPATCH.get(type(update))
+        if handler is None:
+            # Logger is expected to handle all game updates.
+            raise NotImplementedError(f"unhandled game update: {update}")
+        handler(update, log_player, log_referee)
 
 
 async def game_delay(delay: float) -> AsyncGenerator:
@@ -163,9 +178,9 @@ async def game_delay(delay: float) -> AsyncGenerator:
     """
     while True:
         update: GameUpdate = yield
-        match update:
-            case BoardUpdate(_):
-                await asyncio.sleep(delay)
+        if type(update) is not BoardUpdate:
+            continue
+        await asyncio.sleep(delay)
 
 
 async def game_user_wait(stream: LogStream) -> AsyncGenerator:
@@ -179,10 +194,10 @@ async def game_user_wait(stream: LogStream) -> AsyncGenerator:
     """
     while True:
         update: GameUpdate = yield
-        match update:
-            case BoardUpdate(_):
-                stream.info("press enter to continue ...")
-                await asyncio.get_running_loop().run_in_executor(None, input)
+        if type(update) is not BoardUpdate:
+            continue
+        stream.info("press enter to continue ...")
+        await asyncio.get_running_loop().run_in_executor(_INPUT_EXECUTOR, input)
 
 
 async def output_board_updates(stream      : LogStream,
@@ -203,18 +218,91 @@ async def output_board_updates(stream      : LogStream,
     Returns:
         asynchronous interception
     """
+    banners = _board_banners(width)
     while True:
         update: GameUpdate = yield
-        match update:
-            case BoardUpdate(board):
-                stream.info(f"\n{' game board '.center(width, '=')}\n\n")
-                stream.info(
-                    '\n'.join([
-                        f"{'':<7}{line}" for line in
-                        board.render(
-                            use_color=use_color,
-                            use_unicode=use_unicode,
-                        ).splitlines()
-                    ])
-                )
-                stream.info(f"\n{''.center(width, '=')}\n\n")
+        if type(update) is not BoardUpdate:
+            continue
+        _output_board(stream, update.board, banners, use_color, use_unicode)
+
+
+async def board_update_sink(stream         : LogStream,
+                            output_board   = False,
+                            delay          : float = 0,
+                            wait_for_input = False,
+                            use_color      = False,
+                            use_unicode    = False,
+                            width          : int = 66
+                            ) -> AsyncGenerator:
+    """
+    Intercepts board updates and, in order, prints the new board state, delays the game, and waits
+    for user input before continuing, as enabled. This combines ``output_board_updates``,
+    ``game_delay`` and ``game_user_wait`` into a single handler, so each board update is only sent
+    to one handler.
+
+    Args:
+        stream         : log stream
+        output_board   : whether the new board state is printed
+        delay          : delay time, where there is no delay if not positive
+        wait_for_input : whether to wait for user input
+        use_color      : whether ansi color is applied
+        use_unicode    : whether unicode is used
+        width          : the width of log printing
+
+    Returns:
+        asynchronous interception
+    """
+    banners = _board_banners(width)
+    while True:
+        update: GameUpdate = yield
+        if type(update) is not BoardUpdate:
+            continue
+        if output_board:
+            _output_board(stream, update.board, banners, use_color, use_unicode)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if wait_for_input:
+            stream.info("press enter to continue ...")
+            await asyncio.get_running_loop().run_in_executor(_INPUT_EXECUTOR, input)
+
+
+def _board_banners(width: int) -> tuple[str, str, str]:
+    """
+    Build the banners and indentation around a printed board state, which are the same for every
+    board update.
+
+    Args:
+        width: the width of log printing
+    Returns:
+        the header, the footer, and the indentation of each line of the board
+    """
+    return f"\n{' game board '.center(width, '=')}\n\n", f"\n{''.center(width, '=')}\n\n", " " * 7
+
+
+def _output_board(stream      : LogStream,
+                  board       : Board,
+                  banners     : tuple[str, str, str],
+                  use_color   : bool,
+                  use_unicode : bool):
+    """
+    Print a board state in the output stream, formatted using the given options.
+
+    Args:
+        stream      : log stream
+        board       : the board
+        banners     : the header, footer and indentation, from ``_board_banners``
+        use_color   : whether ansi color is applied
+        use_unicode : whether unicode is used
+    """
+    header, footer, indent = banners
+    stream.info(header)
+    stream.info(
+        '\n'.join([
+            indent + line for line in
+            board.render(
+                use_color=use_color,
+                use_unicode=use_unicode,
+            ).splitlines()
+        ])
+    )
+    stream.info(footer)